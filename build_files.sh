@@ -1,11 +1,21 @@
 #!/bin/bash
+set -euo pipefail
 
 echo "Installing dependencies..."
 pip install -r requirements.txt
 
+echo "Building CSS..."
+python manage.py build_css
+
 echo "Collecting static files..."
 python manage.py collectstatic --no-input
 
+echo "Compiling templates..."
+python manage.py warm_templates
+
+echo "Profiling cold-start imports..."
+python manage.py startup_profile --top 10
+
 echo "Running migrations..."
 python manage.py migrate
 
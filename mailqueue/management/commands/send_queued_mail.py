@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from mailqueue.outbox import BATCH_SIZE, deliver_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver queued outbound email. Runs until the queue is drained; '
+        'pass --loop to keep polling (e.g. as a worker process) or schedule it from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new mail.')
+        parser.add_argument('--interval', type=float, default=10, help='Seconds to sleep between polls with --loop.')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = deliver_batch(options['batch_size'])
+            total_sent   += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, failed {failed}.')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done: {total_sent} sent, {total_failed} failed.'))
@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import OutboundEmail
+
+
+BATCH_SIZE         = getattr(settings, 'MAIL_QUEUE_BATCH_SIZE', 50)
+MAX_ATTEMPTS       = getattr(settings, 'MAIL_QUEUE_MAX_ATTEMPTS', 5)
+RETRY_BASE_SECONDS = getattr(settings, 'MAIL_QUEUE_RETRY_BASE_SECONDS', 60)
+CLAIM_TIMEOUT      = getattr(settings, 'MAIL_QUEUE_CLAIM_TIMEOUT', 600)
+
+FAILURE_FIELDS = ['status', 'last_error', 'next_attempt_at']
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+
+def enqueue_many(messages, from_email=None):
+    """Queue ``(subject, message, recipient_list)`` tuples with one INSERT."""
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    return OutboundEmail.objects.bulk_create([
+        OutboundEmail(subject=subject, body=message, from_email=from_email, recipients=list(recipient_list))
+        for subject, message, recipient_list in messages
+    ])
+
+
+def retry_delay(attempts):
+    # 1, 2, 4, 8 ... minutes, capped at a day.
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), 86400))
+
+
+def record_failure(email, error, now):
+    email.last_error = str(error)
+    if email.attempts >= MAX_ATTEMPTS:
+        email.status = 'FAILED'
+    else:
+        email.status = 'QUEUED'
+        email.next_attempt_at = now + retry_delay(email.attempts)
+
+
+def claim_batch(batch_size=BATCH_SIZE, now=None):
+    """
+    Mark up to ``batch_size`` due messages SENDING and count the attempt, in
+    one short transaction. Rows are picked with SKIP LOCKED so several
+    workers can drain the queue at once; messages left SENDING by a worker
+    that died more than CLAIM_TIMEOUT ago are claimed again.
+    """
+    now = now or timezone.now()
+    due = Q(status='QUEUED', next_attempt_at__lte=now) | Q(status='SENDING', locked_at__lt=now - timedelta(seconds=CLAIM_TIMEOUT))
+    with transaction.atomic():
+        batch = list(OutboundEmail.objects.select_for_update(skip_locked=True).filter(due)[:batch_size])
+        for email in batch:
+            email.status    = 'SENDING'
+            email.locked_at = now
+            email.attempts += 1
+        OutboundEmail.objects.bulk_update(batch, ['status', 'locked_at', 'attempts'])
+    return batch
+
+
+def record_result(email, fields):
+    # Only while our claim stands: a row reclaimed after CLAIM_TIMEOUT belongs to another worker.
+    OutboundEmail.objects.filter(pk=email.pk, status='SENDING', locked_at=email.locked_at).update(
+        **{field: getattr(email, field) for field in fields}
+    )
+
+
+def deliver_batch(batch_size=BATCH_SIZE, connection=None):
+    """
+    Send up to ``batch_size`` due messages over one backend connection.
+    Returns ``(sent, failed)``. Messages are claimed first and sent outside
+    any transaction, and each result is saved as soon as it is known, so a
+    slow SMTP server holds no locks and a crash mid-batch re-sends nothing
+    that was already recorded as sent.
+    """
+    now   = timezone.now()
+    batch = claim_batch(batch_size, now)
+    if not batch:
+        return 0, 0
+
+    connection = connection or get_connection()
+    sent = failed = 0
+    try:
+        connection.open()
+    except Exception as e:
+        # Server unreachable: every message in the batch counts as one attempt.
+        for email in batch:
+            record_failure(email, e, now)
+            record_result(email, FAILURE_FIELDS)
+        return 0, len(batch)
+
+    try:
+        for email in batch:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, email.recipients, connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                record_failure(email, e, now)
+                record_result(email, FAILURE_FIELDS)
+                failed += 1
+            else:
+                email.status  = 'SENT'
+                email.sent_at = timezone.now()
+                record_result(email, ['status', 'sent_at'])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import get_connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from mailqueue import outbox
+from mailqueue.models import OutboundEmail
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxTests(TestCase):
+    def queue(self, count=1, **fields):
+        emails = [
+            OutboundEmail.objects.create(subject=f'Message {i}', body='Hello', recipients=[f'user{i}@example.com'], **fields)
+            for i in range(count)
+        ]
+        return emails[0] if count == 1 else emails
+
+    def test_claim_marks_rows_sending(self):
+        self.queue(3)
+        now   = timezone.now()
+        batch = outbox.claim_batch(2, now)
+
+        self.assertEqual(len(batch), 2)
+        claimed = OutboundEmail.objects.filter(status='SENDING')
+        self.assertEqual(claimed.count(), 2)
+        self.assertTrue(all(email.attempts == 1 and email.locked_at == now for email in claimed))
+        self.assertEqual(OutboundEmail.objects.filter(status='QUEUED').count(), 1)
+
+    def test_claim_skips_fresh_claims_and_future_retries(self):
+        self.queue(status='SENDING', locked_at=timezone.now())
+        self.queue(next_attempt_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(outbox.claim_batch(), [])
+
+    def test_stale_claim_is_claimed_again(self):
+        stale = timezone.now() - timedelta(seconds=outbox.CLAIM_TIMEOUT + 1)
+        email = self.queue(status='SENDING', locked_at=stale, attempts=1)
+
+        self.assertEqual([row.pk for row in outbox.claim_batch()], [email.pk])
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 2)
+
+    def test_deliver_batch_sends_and_records(self):
+        self.queue(2)
+
+        self.assertEqual(outbox.deliver_batch(), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(OutboundEmail.objects.exclude(status='SENT').exists())
+        self.assertFalse(OutboundEmail.objects.filter(sent_at=None).exists())
+        self.assertEqual(outbox.deliver_batch(), (0, 0))
+
+    def test_unreachable_server_schedules_a_retry(self):
+        email      = self.queue()
+        connection = get_connection()
+
+        with mock.patch.object(connection, 'open', side_effect=OSError('connection refused')):
+            self.assertEqual(outbox.deliver_batch(connection=connection), (0, 1))
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('QUEUED', 1))
+        self.assertIn('connection refused', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+    def test_last_attempt_fails_the_message(self):
+        email = self.queue(attempts=outbox.MAX_ATTEMPTS - 1)
+
+        with mock.patch('mailqueue.outbox.EmailMessage.send', side_effect=OSError('rejected')):
+            self.assertEqual(outbox.deliver_batch(), (0, 1))
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('FAILED', outbox.MAX_ATTEMPTS))
+
+    def test_result_is_dropped_once_another_worker_reclaims(self):
+        email = self.queue()
+        batch = outbox.claim_batch()
+        OutboundEmail.objects.filter(pk=email.pk).update(locked_at=timezone.now() + timedelta(seconds=1))
+
+        batch[0].status = 'SENT'
+        outbox.record_result(batch[0], ['status'])
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'SENDING')
@@ -1,49 +1,267 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import InterfaceError, OperationalError, connections
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.urls import URLResolver, get_resolver
+from django.utils.functional import SimpleLazyObject
+from studentportal.profiling import RequestProfile, current_profile, histogram
+from studentportal.routers import PIN_COOKIE, SAFE_METHODS, RoutingState, current_routing, replica_health
+
+
+budget_logger = logging.getLogger('studentportal.querybudget')
+
+
+PUBLIC_URL_NAMES = frozenset({'landing', 'login', 'logout', 'register', 'forgot_password', 'catalogue_api'})
+
+ZONE_BY_URLCONF = {
+    'student.urls':   'STUDENT',
+    'principal.urls': 'PRINCIPAL',
+}
+
+
+def _literal_prefix(pattern):
+    route = str(pattern).lstrip('^')
+    for i, char in enumerate(route):
+        if char in '<(?[.*+$\\':
+            return route[:i]
+    return route
+
+
+def _first_segment(path):
+    return path.lstrip('/').split('/', 1)[0]
+
+
+def build_route_table(urlconf=None):
+    """
+    Walk the URLconf once and return ``(public_paths, zones)``:
+
+    * ``public_paths`` - exact paths of the PUBLIC_URL_NAMES routes.
+    * ``zones`` - first path segment -> 'ADMIN' / 'PRINCIPAL' / 'STUDENT' /
+      'ASSET', so a request is classified with a single dict lookup.
+    """
+    public_paths = set()
+    zones = {}
+
+    for prefix in (settings.STATIC_URL, settings.MEDIA_URL):
+        if prefix and prefix.startswith('/') and _first_segment(prefix):
+            zones[_first_segment(prefix)] = 'ASSET'
+
+    def walk(patterns, prefix, zone):
+        for pattern in patterns:
+            route = prefix + _literal_prefix(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                if pattern.app_name == 'admin':
+                    zones.setdefault(_first_segment(route), 'ADMIN')
+                    continue
+                urlconf_name = pattern.urlconf_name
+                child_zone = ZONE_BY_URLCONF.get(getattr(urlconf_name, '__name__', urlconf_name), zone)
+                walk(pattern.url_patterns, route, child_zone)
+            elif pattern.name in PUBLIC_URL_NAMES:
+                public_paths.add('/' + route)
+            elif pattern.callback.__module__ == 'django.views.static':
+                zones.setdefault(_first_segment(route), 'ASSET')
+            elif zone and _first_segment(route):
+                zones.setdefault(_first_segment(route), zone)
+
+    walk(get_resolver(urlconf).url_patterns, '', None)
+    return frozenset(public_paths), MappingProxyType(zones)
 
 
 class RoleBasedAccessMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self._routes = None
+
+    @property
+    def routes(self):
+        # Built on first use rather than in __init__ so the URLconf (and the
+        # views it imports) is fully loaded.
+        if self._routes is None:
+            self._routes = build_route_table()
+        return self._routes
 
     def __call__(self, request):
-        # Public paths 
-        public_paths = ['/', '/login/', '/register/', '/logout/','/forgot-password/']
-        
-        if any(request.path == path for path in public_paths):
+        public_paths, zones = self.routes
+        if request.path in public_paths:
             return self.get_response(request)
 
-        if request.path.startswith('/admin/'):
+        zone = zones.get(_first_segment(request.path))
+
+        # Static/media and the admin never touch the session or request.user here.
+        if zone in ('ASSET', 'ADMIN'):
             return self.get_response(request)
 
         if not request.user.is_authenticated:
             messages.error(request, 'Please login to access this page.')
             return redirect('login')
 
-        response = self.get_response(request)
+        # Role-based access control
+        user_role = getattr(request.user, 'role', None)
+
+        if user_role == 'STUDENT' and zone == 'PRINCIPAL':
+            messages.error(request, 'Access denied. Principal access only.')
+            return redirect('student_dashboard')
+
+        if user_role == 'PRINCIPAL' and zone == 'STUDENT':
+            messages.error(request, 'Access denied. Student access only.')
+            return redirect('principal_dashboard')
+
+        return self.get_response(request)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Opens the per-request routing state for studentportal.routers: safe
+    requests read from a replica unless the client is pinned to the primary,
+    and requests that write pin it there for REPLICA_STICKY_SECONDS.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'DATABASE_REPLICAS', None):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sticky_seconds = settings.REPLICA_STICKY_SECONDS
+
+    def __call__(self, request):
+        safe  = request.method in SAFE_METHODS
+        state = RoutingState(use_replica=safe and PIN_COOKIE not in request.COOKIES)
+        token = current_routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+        if state.wrote or not safe:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=self.sticky_seconds,
+                secure=request.is_secure(), httponly=True, samesite='Lax',
+            )
         return response
 
-    def process_view(self, request, view_func, view_args, view_kwargs):
-        if request.path.startswith('/admin/'):
+    def process_exception(self, request, exception):
+        # A replica that fails mid-request is skipped until its retry is due.
+        state = current_routing.get()
+        if state is None or state.replica is None:
             return None
+        if isinstance(exception, (OperationalError, InterfaceError)) and connections[state.replica].errors_occurred:
+            replica_health.mark_down(state.replica, str(exception))
+        return None
 
-        public_paths = ['/', '/login/', '/register/', '/logout/','/forgot-password/']
-        if request.path in public_paths:
-            return None
 
-        if not request.user.is_authenticated:
-            return None  
+class QueryTimer:
+    """execute_wrapper that counts queries and the time spent in them."""
 
-        # Role-based access control
-        if hasattr(request.user, 'role'):
-            user_role = request.user.role
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class QueryBudgetMiddleware:
+    """
+    Logs requests that run more than QUERY_BUDGET_MAX_QUERIES queries or spend
+    more than QUERY_BUDGET_MAX_DB_MS in the database.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.max_queries = settings.QUERY_BUDGET_MAX_QUERIES
+        self.max_db_ms = settings.QUERY_BUDGET_MAX_DB_MS
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = timer.seconds * 1000
+
+        if timer.count > self.max_queries or db_ms > self.max_db_ms:
+            budget_logger.warning(
+                'Query budget exceeded: %s %s ran %d queries in %.1f ms (request %.1f ms)',
+                request.method, request.path, timer.count, db_ms, total_ms,
+            )
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a PROFILING_SAMPLE_RATE fraction of requests: total, DB,
+    template and session/auth time, query count and duplicate queries.
+    Results go out as a ``Server-Timing`` header and into the per-process
+    rolling histogram in studentportal.profiling.
+    """
 
-            if user_role == 'STUDENT' and request.path.startswith('/principal/'):
-                messages.error(request, 'Access denied. Principal access only.')
-                return redirect('student_dashboard')
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.directory = settings.PROFILING_DIR
+        self.flush_interval = settings.PROFILING_FLUSH_SECONDS
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        profile.finish()
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unresolved'
+        response['Server-Timing'] = profile.server_timing()
+        histogram.record(route, profile)
+        histogram.maybe_flush(self.directory, self.flush_interval)
+        return response
+
+
+class ProfilingAuthMiddleware:
+    """
+    Goes right after AuthenticationMiddleware and times the lazy session +
+    user load the first time something touches ``request.user``.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = current_profile.get()
+        if profile is not None and hasattr(request, 'user'):
+            lazy_user = request.user
 
-            if user_role == 'PRINCIPAL' and request.path.startswith('/student/'):
-                messages.error(request, 'Access denied. Student access only.')
-                return redirect('principal_dashboard')
+            def load_user():
+                start = time.perf_counter()
+                lazy_user.pk  # forces the session read and user query
+                profile.auth_seconds += time.perf_counter() - start
+                return lazy_user._wrapped
 
-        return None
\ No newline at end of file
+            request.user = SimpleLazyObject(load_user)
+        return self.get_response(request)
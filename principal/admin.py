@@ -7,10 +7,7 @@ class DepartmentAdmin(admin.ModelAdmin):
     list_display = ('dept_name', 'dept_description', 'course_count')
     search_fields = ('dept_name',)
     ordering = ('dept_name',)
-
-    def course_count(self, obj):
-        return AddOnCourse.objects.filter(department=obj).count()
-    course_count.short_description = 'Courses'
+    readonly_fields = ('course_count',)
 
 
 class AddOnCourseInline(admin.TabularInline):
@@ -22,11 +19,11 @@ class AddOnCourseInline(admin.TabularInline):
 
 @admin.register(AddOnCourse)
 class AddOnCourseAdmin(admin.ModelAdmin):
-    list_display = ('course_id', 'course_name', 'department', 'formatted_price', 'created_at')
+    list_display = ('course_id', 'course_name', 'department', 'formatted_price', 'enrolled_count', 'approved_count', 'pending_count', 'created_at')
     list_filter = ('department',)
     search_fields = ('course_id', 'course_name')
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'formatted_price')
+    readonly_fields = ('created_at', 'formatted_price', 'enrolled_count', 'approved_count', 'pending_count')
     date_hierarchy = 'created_at'
     fieldsets = (
         ('Course Identity', {
@@ -35,6 +32,9 @@ class AddOnCourseAdmin(admin.ModelAdmin):
         ('Details', {
             'fields': ('course_description', 'course_price', 'formatted_price')
         }),
+        ('Enrollments', {
+            'fields': ('enrolled_count', 'approved_count', 'pending_count')
+        }),
         ('Meta', {
             'fields': ('created_at',),
             'classes': ('collapse',)
@@ -0,0 +1,177 @@
+"""
+Enrollment analytics rollups.
+
+``EnrollmentRollup`` holds request counts, approved revenue and approval
+latency per course per day of ``purchased_at``. ``refresh_rollups()``
+keeps it current incrementally: it finds requests whose ``updated_at`` is
+past the stored watermark (new requests as well as later approvals and
+rejections of old ones), and recomputes only the (course, day) buckets
+they fall in. The analytics page and JSON endpoint read the rollups only.
+
+Deleting requests does not touch ``updated_at`` of anything, so their
+buckets are corrected on the next change to the same bucket or by a
+``refresh_analytics --full`` rebuild.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+from student.models import StudentCourse
+from principal.models import AnalyticsWatermark, EnrollmentRollup
+
+
+WATERMARK = 'enrollment_rollups'
+
+# Rows committed late with an earlier updated_at (long transactions) are
+# still caught as long as they land within this lag.
+REFRESH_LAG = timedelta(seconds=getattr(settings, 'ANALYTICS_REFRESH_LAG_SECONDS', 5))
+
+DEFAULT_DAYS = getattr(settings, 'ANALYTICS_DEFAULT_DAYS', 365)
+
+GROUPS = {
+    'total':      (),
+    'department': ('department_id', 'department__dept_name'),
+    'course':     ('course_id', 'course__course_id', 'course__course_name'),
+}
+
+PERIODS = ('day', 'month', 'all')
+
+
+def _bucket_totals(requests):
+    approved      = Q(status='APPROVED')
+    timed_approve = Q(status='APPROVED', approved_at__isnull=False)
+    return (
+        requests
+        .annotate(day=TruncDate('purchased_at'))
+        .values('course_id', 'course__department_id', 'day')
+        .annotate(
+            requests=Count('pk'),
+            pending=Count('pk', filter=Q(status='PENDING')),
+            approved=Count('pk', filter=approved),
+            rejected=Count('pk', filter=Q(status='REJECTED')),
+            approved_revenue=Sum('course__course_price', filter=approved),
+            approval_time=Sum(
+                ExpressionWrapper(F('approved_at') - F('purchased_at'), output_field=DurationField()),
+                filter=timed_approve,
+            ),
+            approval_samples=Count('pk', filter=timed_approve),
+        )
+        .order_by()
+    )
+
+
+def _rollup(row):
+    approval_time = row['approval_time']
+    return EnrollmentRollup(
+        day=row['day'],
+        course_id=row['course_id'],
+        department_id=row['course__department_id'],
+        request_count=row['requests'],
+        pending_count=row['pending'],
+        approved_count=row['approved'],
+        rejected_count=row['rejected'],
+        approved_revenue=row['approved_revenue'] or 0,
+        approval_seconds=approval_time.total_seconds() if approval_time else 0,
+        approval_samples=row['approval_samples'],
+    )
+
+
+def _dirty_buckets(since, until):
+    """``{day: {course_id, ...}}`` for requests changed in (since, until]."""
+    changed = (
+        StudentCourse.objects.filter(updated_at__gt=since, updated_at__lte=until)
+        .annotate(day=TruncDate('purchased_at'))
+        .values_list('day', 'course_id')
+        .distinct()
+        .order_by()
+    )
+    buckets = {}
+    for day, course_id in changed.iterator():
+        buckets.setdefault(day, set()).add(course_id)
+    return buckets
+
+
+def refresh_rollups(full=False, now=None):
+    """
+    Bring the rollups up to date. Returns the number of buckets rewritten.
+    ``full`` (or a missing watermark) rebuilds every bucket.
+    """
+    now   = now or timezone.now()
+    until = now - REFRESH_LAG
+
+    with transaction.atomic():
+        mark, _ = AnalyticsWatermark.objects.select_for_update().get_or_create(name=WATERMARK)
+
+        if full or mark.value is None:
+            EnrollmentRollup.objects.all().delete()
+            rows = _bucket_totals(StudentCourse.objects.all())
+        else:
+            buckets = _dirty_buckets(mark.value, until)
+            if not buckets:
+                rows = []
+            else:
+                source = Q()
+                stale  = Q()
+                for day, course_ids in buckets.items():
+                    source |= Q(purchased_at__date=day, course_id__in=course_ids)
+                    stale  |= Q(day=day, course_id__in=course_ids)
+                EnrollmentRollup.objects.filter(stale).delete()
+                rows = _bucket_totals(StudentCourse.objects.filter(source))
+
+        rollups = [_rollup(row) for row in rows]
+        EnrollmentRollup.objects.bulk_create(rollups, batch_size=1000)
+
+        mark.value = until
+        mark.refreshed_at = now
+        mark.save()
+    return len(rollups)
+
+
+def last_refresh():
+    return AnalyticsWatermark.objects.filter(name=WATERMARK).values_list('refreshed_at', flat=True).first()
+
+
+def rollup_report(group='department', period='month', days=DEFAULT_DAYS):
+    """
+    Sum the rollups of the last ``days`` days by ``group`` (total /
+    department / course) and ``period`` (day / month / all). Returns a list
+    of dicts with counts, revenue, approval rate and average approval hours.
+    """
+    fields = list(GROUPS[group])
+    rollups = EnrollmentRollup.objects.filter(day__gte=timezone.localdate() - timedelta(days=days))
+    if period == 'month':
+        rollups = rollups.annotate(period=TruncMonth('day'))
+        fields.append('period')
+    elif period == 'day':
+        rollups = rollups.annotate(period=F('day'))
+        fields.append('period')
+
+    sums = {
+        'requests':        Sum('request_count'),
+        'pending':         Sum('pending_count'),
+        'approved':        Sum('approved_count'),
+        'rejected':        Sum('rejected_count'),
+        'revenue':         Sum('approved_revenue'),
+        'latency_seconds': Sum('approval_seconds'),
+        'latency_samples': Sum('approval_samples'),
+    }
+    if fields:
+        order = ['-period'] if 'period' in fields else []
+        rows = rollups.values(*fields).annotate(**sums).order_by(*order, '-revenue', '-requests')
+    else:
+        rows = [rollups.aggregate(**sums)]
+
+    report = []
+    for row in rows:
+        for key in sums:
+            row[key] = row[key] or 0
+        decided = row['approved'] + row['rejected']
+        samples = row.pop('latency_samples')
+        seconds = row.pop('latency_seconds')
+        row['approval_rate']      = round(row['approved'] / decided * 100, 1) if decided else None
+        row['avg_approval_hours'] = round(seconds / samples / 3600, 1) if samples else None
+        report.append(row)
+    return report
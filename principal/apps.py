@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class PrincipalConfig(AppConfig):
     name = 'principal'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from .search_index import connect
+        connect(self)
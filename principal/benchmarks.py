@@ -0,0 +1,230 @@
+"""
+Seeding and measurement helpers behind ``manage.py benchmark_views``.
+
+Every named route in ``student.urls`` and ``principal.urls`` is requested
+with GET as the role that owns it, the write endpoints are also POSTed a
+typical form (``WRITE_SCENARIOS``), and the query count, wall time and peak
+Python memory of each request are recorded. Any response other than the
+expected status fails the run.
+"""
+import random
+import time
+import tracemalloc
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.urls import URLPattern, get_resolver, reverse
+from student.models import Student, StudentCourse
+from principal.catalogue import bump_catalogue_version
+from principal.counters import rebuild_counters
+from principal.models import AddOnCourse, Department
+
+
+BENCH_PASSWORD = 'benchmark'
+PUBLIC_VIEWS   = {'landing', 'login', 'register', 'catalogue_api'}
+# Views that change state or end the session; measured last so they do not
+# disturb the others.
+MUTATING_VIEWS = {'logout', 'approve_course', 'reject_course', 'delete_course'}
+# Accept POST only; measured through WRITE_SCENARIOS instead.
+POST_ONLY_VIEWS = {'bulk_update_requests'}
+EXPECTED_STATUS = {name: 302 for name in MUTATING_VIEWS}
+
+
+def seed(students, courses, departments=10, purchases_per_student=3, rng=None):
+    rng = rng or random.Random(0)
+    password = make_password(BENCH_PASSWORD)
+
+    StudentCourse.objects.all().delete()
+    Student.objects.all().delete()
+    AddOnCourse.objects.all().delete()
+    Department.objects.all().delete()
+
+    depts = Department.objects.bulk_create([
+        Department(dept_name=f'Department {i}', dept_description=f'Synthetic department {i}')
+        for i in range(departments)
+    ])
+    course_rows = AddOnCourse.objects.bulk_create([
+        AddOnCourse(
+            course_id=f'CRS-{i:05}', course_name=f'Course {i}', department=depts[i % departments],
+            course_description=f'Synthetic course number {i}', course_price=rng.randint(1, 50) * 100,
+        )
+        for i in range(courses)
+    ], batch_size=1000)
+
+    Student.objects.create(
+        username='principal', email='principal@bench.local', std_reg_no='P0000',
+        role='PRINCIPAL', password=password, first_name='Bench', last_name='Principal',
+    )
+    Student.objects.bulk_create([
+        Student(
+            username=f'student{i}', email=f'student{i}@bench.local', std_reg_no=f'R{i:07}',
+            first_name=f'First{i}', last_name=f'Last{i}', std_dept=depts[i % departments],
+            role='STUDENT', password=password,
+        )
+        for i in range(students)
+    ], batch_size=1000)
+
+    student_ids = list(Student.objects.filter(role='STUDENT').values_list('pk', flat=True))
+    statuses    = ['PENDING', 'APPROVED', 'REJECTED']
+    purchases   = []
+    for student_id in student_ids:
+        for course in rng.sample(course_rows, min(purchases_per_student, len(course_rows))):
+            purchases.append(StudentCourse(student_id=student_id, course_id=course.pk, status=rng.choice(statuses)))
+    StudentCourse.objects.bulk_create(purchases, batch_size=2000)
+    rebuild_counters()
+    bump_catalogue_version()
+
+
+def benchmark_routes():
+    """Yield ``(name, zone)`` for every named route of the two apps."""
+    for resolver in get_resolver().url_patterns:
+        urlconf = getattr(resolver, 'urlconf_name', None)
+        module  = getattr(urlconf, '__name__', urlconf)
+        if module not in ('student.urls', 'principal.urls'):
+            continue
+        for pattern in resolver.url_patterns:
+            if isinstance(pattern, URLPattern) and pattern.name and pattern.name not in POST_ONLY_VIEWS:
+                yield pattern.name, module.split('.')[0]
+
+
+def route_url(name):
+    kwargs = {}
+    if name == 'student_detail':
+        kwargs['pk'] = Student.objects.filter(role='STUDENT').values_list('pk', flat=True).first()
+    elif name == 'delete_course':
+        kwargs['pk'] = AddOnCourse.objects.values_list('pk', flat=True).first()
+    elif name in ('approve_course', 'reject_course'):
+        kwargs['pk'] = StudentCourse.objects.filter(status='PENDING').values_list('pk', flat=True).first()
+    return reverse(name, kwargs=kwargs or None)
+
+
+def bench_student():
+    return Student.objects.filter(role='STUDENT').order_by('pk').first()
+
+
+def client_for(name, zone):
+    client = Client()
+    if name in PUBLIC_VIEWS:
+        return client
+    if zone == 'principal':
+        user = Student.objects.get(username='principal')
+    else:
+        user = bench_student()
+    client.force_login(user)
+    return client
+
+
+# ------------------------------------------------------------------------------
+# Write scenarios: each returns (url, POST data) for the current seed.
+# ------------------------------------------------------------------------------
+def purchase_post():
+    student = bench_student()
+    taken   = StudentCourse.objects.filter(student=student).values('course_id')
+    ids     = AddOnCourse.objects.exclude(pk__in=taken).order_by('pk').values_list('pk', flat=True)[:3]
+    return reverse('purchase_course'), {'course_ids': ','.join(str(pk) for pk in ids)}
+
+
+def bulk_ids_post():
+    ids = StudentCourse.objects.filter(status='PENDING').order_by('pk').values_list('pk', flat=True)[:20]
+    return reverse('bulk_update_requests'), {'action': 'approve', 'ids': [str(pk) for pk in ids]}
+
+
+def bulk_filter_post():
+    dept = Department.objects.order_by('pk').values_list('pk', flat=True).first()
+    return reverse('bulk_update_requests'), {'action': 'reject', 'dept': str(dept)}
+
+
+def student_detail_post():
+    purchase = StudentCourse.objects.filter(status='PENDING').order_by('pk').first()
+    url      = reverse('student_detail', kwargs={'pk': purchase.student_id})
+    return url, {'action': 'approve_purchase', 'purchase_id': str(purchase.pk)}
+
+
+def add_course_post():
+    dept = Department.objects.order_by('pk').values_list('pk', flat=True).first()
+    return reverse('add_course'), {
+        'course_name':        'Benchmark course',
+        'course_id':          f'BENCH{AddOnCourse.objects.count()}',
+        'department':         str(dept),
+        'course_description': 'Added by the benchmark.',
+        'course_price':       '100',
+    }
+
+
+def delete_course_post():
+    # A seeded course, so the delete cascades to enrollments that grow with the scale.
+    course = AddOnCourse.objects.order_by('pk').values_list('pk', flat=True).first()
+    return reverse('delete_course', kwargs={'pk': course}), {}
+
+
+# name -> (route, zone, build, expected status)
+WRITE_SCENARIOS = {
+    'purchase_course:post': ('purchase_course',      'student',   purchase_post,       302),
+    'bulk_update:ids':      ('bulk_update_requests', 'principal', bulk_ids_post,       200),
+    'bulk_update:filter':   ('bulk_update_requests', 'principal', bulk_filter_post,    200),
+    'student_detail:post':  ('student_detail',       'principal', student_detail_post, 302),
+    'add_course:post':      ('add_course',           'principal', add_course_post,     302),
+    'delete_course:post':   ('delete_course',        'principal', delete_course_post,  302),
+}
+
+
+class QueryCounter:
+    """
+    execute_wrapper that counts statements. Unlike ``connection.queries``
+    (what CaptureQueriesContext reads) it has no 9000-entry cap, so seeding
+    a large scale can't leave it full and reporting 0.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(name, zone, method='get', url=None, data=None, expected=200):
+    url    = url or route_url(name)
+    client = client_for(name, zone)
+    send   = getattr(client, method)
+    for cache in caches.all():
+        cache.clear()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    queries = QueryCounter()
+    with connection.execute_wrapper(queries):
+        response = send(url, data) if data is not None else send(url)
+        if response.streaming:
+            # Exports do their queries while the body is being consumed.
+            for _ in response.streaming_content:
+                pass
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'status':   response.status_code,
+        'expected': expected,
+        'queries':  queries.count,
+        'ms':       round(elapsed * 1000, 2),
+        'peak_kb':  round(peak / 1024, 1),
+    }
+
+
+def run(scale, courses):
+    seed(students=scale, courses=courses)
+    routes   = list(benchmark_routes())
+    mutating = [(name, zone) for name, zone in routes if name in MUTATING_VIEWS]
+    results  = {}
+    for name, zone in routes:
+        if name not in MUTATING_VIEWS:
+            results[name] = measure(name, zone)
+    for scenario, (name, zone, build, expected) in WRITE_SCENARIOS.items():
+        url, data = build()
+        results[scenario] = measure(name, zone, 'post', url, data, expected)
+    for name, zone in mutating:
+        results[name] = measure(name, zone, expected=EXPECTED_STATUS[name])
+    return results
@@ -0,0 +1,74 @@
+"""
+Read-only course catalogue for the JSON API.
+
+The catalogue changes rarely, so every response is tagged with the
+catalogue version: a database counter bumped whenever a course or a
+department is saved or deleted. The ETag is that version plus the page
+parameters, so a client (or a CDN) holding a page can revalidate it with
+``If-None-Match`` for the price of a one-row lookup, and pages themselves
+are cached under the version and never need invalidating.
+
+Enrollment counters are left out of the payload on purpose: they change
+with every request a student makes and would make the version useless.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from principal.models import AddOnCourse, VersionCounter
+from principal.pagination import keyset_page
+
+
+CATALOGUE_VERSION = 'catalogue'
+
+MAX_AGE            = getattr(settings, 'CATALOGUE_MAX_AGE', 60)
+SHARED_MAX_AGE     = getattr(settings, 'CATALOGUE_SHARED_MAX_AGE', 300)
+PAGE_CACHE_TIMEOUT = getattr(settings, 'CATALOGUE_PAGE_CACHE_TIMEOUT', 3600)
+
+
+def catalogue_version():
+    value = VersionCounter.objects.filter(name=CATALOGUE_VERSION).values_list('value', flat=True).first()
+    return value or 1
+
+
+def bump_catalogue_version():
+    VersionCounter.bump(CATALOGUE_VERSION)
+
+
+def catalogue_etag(version, dept=None, after=None, before=None, size=None):
+    params = hashlib.md5(f'{dept}:{after}:{before}:{size}'.encode()).hexdigest()[:12]
+    return f'"catalogue-{version}-{params}"'
+
+
+def _course(course):
+    department = course.department
+    return {
+        'id':          course.pk,
+        'course_id':   course.course_id,
+        'name':        course.course_name,
+        'description': course.course_description,
+        'price':       course.course_price,
+        'department':  {'id': department.pk, 'name': department.dept_name} if department else None,
+    }
+
+
+def catalogue_page(version, dept=None, after=None, before=None, size=None):
+    """One page of the catalogue (optionally one department's), newest course first."""
+    key  = f'catalogue:{version}:{dept}:{after}:{before}:{size}'
+    page = cache.get(key)
+    if page is None:
+        courses = AddOnCourse.objects.select_related('department').only(
+            'course_id', 'course_name', 'course_description', 'course_price',
+            'department__id', 'department__dept_name',
+        )
+        if dept:
+            courses = courses.filter(department__pk=dept)
+        rows, next_cursor, prev_cursor = keyset_page(courses, after=after, before=before, size=size)
+        page = {
+            'version':  version,
+            'results':  [_course(course) for course in rows],
+            'next':     next_cursor,
+            'previous': prev_cursor,
+        }
+        cache.set(key, page, PAGE_CACHE_TIMEOUT)
+    return page
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.staticfiles)
+def tailwind_css_built(app_configs, **kwargs):
+    # Tagged staticfiles so collectstatic runs it: a build without the
+    # compiled stylesheet fails there instead of shipping the play CDN.
+    if getattr(settings, 'TAILWIND_CDN_FALLBACK', settings.DEBUG):
+        return []
+    css = getattr(settings, 'TAILWIND_CSS', 'css/tailwind.css')
+    if finders.find(css):
+        return []
+    return [Error(
+        f'{css} has not been built and TAILWIND_CDN_FALLBACK is off.',
+        hint='Run `manage.py build_css` (needs the Tailwind CLI), or set TAILWIND_CDN_FALLBACK=True '
+             'to let pages compile their styles in the browser.',
+        id='principal.E001',
+    )]
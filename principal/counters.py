@@ -0,0 +1,102 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from student.models import StudentCourse
+from principal.models import AddOnCourse, Department
+
+
+STATUS_COUNTERS = {
+    'PENDING':  'pending_count',
+    'APPROVED': 'approved_count',
+}
+
+
+def enrollment_deltas(status, sign=1):
+    deltas = {'enrolled_count': sign}
+    if status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[status]] = sign
+    return deltas
+
+
+def transition_deltas(old_status, new_status, count=1):
+    deltas = Counter()
+    if old_status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[old_status]] -= count
+    if new_status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[new_status]] += count
+    return deltas
+
+
+def apply_course_deltas(deltas):
+    """
+    ``deltas`` maps course pk -> {counter_field: delta}. All courses are
+    adjusted in a single UPDATE with one CASE per counter column.
+    """
+    deltas = {pk: {f: d for f, d in fields.items() if d} for pk, fields in deltas.items()}
+    deltas = {pk: fields for pk, fields in deltas.items() if fields}
+    if not deltas:
+        return
+
+    updates = {}
+    for field in AddOnCourse.counter_fields:
+        whens = [When(pk=pk, then=F(field) + fields[field]) for pk, fields in deltas.items() if field in fields]
+        if whens:
+            updates[field] = Case(*whens, default=F(field))
+    AddOnCourse.objects.filter(pk__in=deltas).update(**updates)
+
+
+def apply_department_delta(department_id, delta):
+    if department_id and delta:
+        Department.objects.filter(pk=department_id).update(course_count=F('course_count') + delta)
+
+
+def bulk_transition_deltas(course_ids, old_status, new_status):
+    deltas = defaultdict(Counter)
+    for course_id, count in Counter(course_ids).items():
+        deltas[course_id].update(transition_deltas(old_status, new_status, count))
+    return deltas
+
+
+def bulk_enrollment_deltas(course_ids, status='PENDING'):
+    deltas = defaultdict(Counter)
+    for course_id in course_ids:
+        deltas[course_id].update(enrollment_deltas(status))
+    return deltas
+
+
+def deleted_enrollment_deltas(enrollments):
+    """Deltas for deleting every row of ``enrollments``, from one grouped query."""
+    deltas = defaultdict(Counter)
+    for row in enrollments.order_by().values('course', 'status').annotate(n=Count('pk')):
+        deltas[row['course']].update(enrollment_deltas(row['status'], sign=-row['n']))
+    return deltas
+
+
+def rebuild_counters():
+    def count_of(condition=None):
+        rows = StudentCourse.objects.filter(course=OuterRef('pk'))
+        if condition is not None:
+            rows = rows.filter(condition)
+        return Coalesce(
+            Subquery(rows.order_by().values('course').annotate(c=Count('pk')).values('c')),
+            Value(0),
+        )
+
+    with transaction.atomic():
+        courses = AddOnCourse.objects.update(
+            enrolled_count=count_of(),
+            approved_count=count_of(Q(status='APPROVED')),
+            pending_count=count_of(Q(status='PENDING')),
+        )
+        departments = Department.objects.update(
+            course_count=Coalesce(
+                Subquery(
+                    AddOnCourse.objects.filter(department=OuterRef('pk'))
+                    .order_by().values('department').annotate(c=Count('pk')).values('c')
+                ),
+                Value(0),
+            ),
+        )
+    return courses, departments
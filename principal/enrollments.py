@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from student.models import StudentCourse
+from student.summary import invalidate_enrollment_summaries
+from principal.fragments import bump_versions
+from principal.counters import apply_course_deltas, bulk_transition_deltas
+from principal.filters import parse_pk
+
+
+BULK_ACTIONS = {
+    'approve': 'APPROVED',
+    'reject':  'REJECTED',
+}
+
+
+def parse_ids(values):
+    ids = []
+    for value in values:
+        for part in str(value).split(','):
+            part = part.strip()
+            if part.isdigit():
+                ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+
+def _filter_pk(value, name):
+    if not value:
+        return None
+    pk = parse_pk(value)
+    if pk is None:
+        raise ValueError(f'Invalid {name}: {value!r}.')
+    return pk
+
+
+def _filter_date(value, name):
+    if not value:
+        return None
+    try:
+        date = parse_date(value.strip())
+    except ValueError:
+        date = None  # well formed but not a real date, e.g. 2024-13-45
+    if date is None:
+        raise ValueError(f'Invalid {name} date: {value!r} (use YYYY-MM-DD).')
+    return date
+
+
+def pending_filter(ids=None, department=None, course=None, purchased_from=None, purchased_to=None):
+    """
+    Build the queryset of PENDING requests a bulk action applies to.
+    Returns ``None`` when no selector was given, so callers never act on
+    every pending request by accident. Raises ValueError for a malformed
+    department, course or date.
+    """
+    department     = _filter_pk(department, 'department')
+    course         = _filter_pk(course, 'course')
+    purchased_from = _filter_date(purchased_from, 'purchased_from')
+    purchased_to   = _filter_date(purchased_to, 'purchased_to')
+    if not any([ids, department, course, purchased_from, purchased_to]):
+        return None
+
+    requests = StudentCourse.objects.filter(status='PENDING')
+    if ids:
+        requests = requests.filter(pk__in=ids)
+    if department:
+        requests = requests.filter(course__department__pk=department)
+    if course:
+        requests = requests.filter(course__pk=course)
+    if purchased_from:
+        requests = requests.filter(purchased_at__date__gte=purchased_from)
+    if purchased_to:
+        requests = requests.filter(purchased_at__date__lte=purchased_to)
+    return requests
+
+
+def transition_requests(requests, status, ids=None):
+    """
+    Move every row of ``requests`` (a PENDING queryset) to ``status`` with a
+    single UPDATE. Returns ``{pk: outcome}`` where outcome is the new status
+    for changed rows, ``'already_<status>'`` for requested ids that were no
+    longer pending, or ``'not_found'``.
+    """
+    now     = timezone.now()
+    changes = {'status': status, 'updated_at': now}
+    if status == 'APPROVED':
+        changes['approved_at'] = now
+
+    with transaction.atomic():
+        rows    = list(requests.select_for_update(of=('self',)).order_by().values_list('pk', 'student_id', 'course_id'))
+        matched = [pk for pk, _, _ in rows]
+        StudentCourse.objects.filter(pk__in=matched, status='PENDING').update(**changes)
+        # QuerySet.update() sends no signals, so keep counters and caches in step here.
+        apply_course_deltas(bulk_transition_deltas([course_id for _, _, course_id in rows], 'PENDING', status))
+
+    invalidate_enrollment_summaries(student_id for _, student_id, _ in rows)
+    bump_versions('studentcourse')
+
+    results = {pk: status for pk in matched}
+    missing = [pk for pk in (ids or []) if pk not in results]
+    if missing:
+        current = dict(StudentCourse.objects.filter(pk__in=missing).values_list('pk', 'status'))
+        for pk in missing:
+            results[pk] = f'already_{current[pk].lower()}' if pk in current else 'not_found'
+    return results
+
+
+def transition_request(request_obj, status):
+    request_obj.status = status
+    update_fields = ['status', 'updated_at']
+    if status == 'APPROVED':
+        request_obj.approved_at = timezone.now()
+        update_fields.append('approved_at')
+    request_obj.save(update_fields=update_fields)
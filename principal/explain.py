@@ -0,0 +1,125 @@
+"""
+Query-plan report behind ``manage.py explain_views``.
+
+Each view is requested the same way ``benchmark_views`` does it, the SQL it
+runs is captured with its parameters, and every distinct SELECT is passed
+to the database's EXPLAIN. The plan is reduced to the indexes it uses and
+the tables it reads in full.
+"""
+import json
+
+from django.core.cache import caches
+from django.core.management.base import CommandError
+from django.db import connection
+from mailqueue.models import OutboundEmail
+from principal.benchmarks import client_for, route_url
+from student.models import Student, StudentCourse
+
+
+# Tables that grow with the number of students; a full scan of one of
+# these is worth looking at, a scan of departments or courses is not.
+LARGE_TABLES = {model._meta.db_table for model in (Student, StudentCourse, OutboundEmail)}
+
+PLANNERS = ('postgresql', 'sqlite')
+
+PG_INDEX_NODES = {'Index Scan', 'Index Only Scan', 'Bitmap Index Scan'}
+
+
+class Capture:
+    """``execute_wrapper`` that records ``(sql, params)`` of every SELECT."""
+
+    def __init__(self):
+        self.statements = []
+        self.seen = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT') and sql not in self.seen:
+            self.seen.add(sql)
+            self.statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def capture(name, zone):
+    """Distinct SELECTs (with parameters) run while serving the route ``name``."""
+    url    = route_url(name)
+    client = client_for(name, zone)
+    for cache in caches.all():
+        cache.clear()
+
+    recorder = Capture()
+    with connection.execute_wrapper(recorder):
+        response = client.get(url)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+    return response.status_code, recorder.statements
+
+
+def _sqlite_plan(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        details = [row[-1] for row in cursor.fetchall()]
+
+    indexes, scans = [], []
+    for detail in details:
+        # "SEARCH t USING INDEX i (...)", "SCAN t USING COVERING INDEX i",
+        # "SEARCH t USING INTEGER PRIMARY KEY (rowid=?)", "SCAN t"
+        words = detail.split()
+        if words[0] in ('SEARCH', 'SCAN') and len(words) > 1:
+            table = words[1]
+            if 'INDEX' in words:
+                indexes.append(words[words.index('INDEX') + 1])
+            elif 'PRIMARY' in words:
+                indexes.append(f'{table} (primary key)')
+            elif words[0] == 'SCAN' and not table.startswith('('):
+                scans.append(table)
+    return details, indexes, scans
+
+
+def _pg_nodes(node):
+    yield node
+    for child in node.get('Plans', ()):
+        yield from _pg_nodes(child)
+
+
+def _postgres_plan(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    details, indexes, scans = [], [], []
+    for node in _pg_nodes(plan[0]['Plan']):
+        kind = node['Node Type']
+        if kind in PG_INDEX_NODES:
+            indexes.append(node['Index Name'])
+            details.append(f'{kind} using {node["Index Name"]} on {node.get("Relation Name", "")}'.strip())
+        elif kind == 'Seq Scan':
+            scans.append(node['Relation Name'])
+            details.append(f'Seq Scan on {node["Relation Name"]}')
+    return details, indexes, scans
+
+
+def explain(sql, params):
+    """``{'details', 'indexes', 'scans', 'verdict'}`` for one statement."""
+    if connection.vendor == 'postgresql':
+        details, indexes, scans = _postgres_plan(sql, params)
+    elif connection.vendor == 'sqlite':
+        details, indexes, scans = _sqlite_plan(sql, params)
+    else:
+        raise CommandError(f'Reading query plans is only supported on {" and ".join(PLANNERS)}, not {connection.vendor}.')
+
+    large_scans = [table for table in scans if table in LARGE_TABLES]
+    if large_scans:
+        verdict = 'SCAN'
+    elif indexes:
+        verdict = 'INDEX'
+    else:
+        verdict = 'SMALL'  # only small tables read in full, or no table at all
+    return {'details': details, 'indexes': indexes, 'scans': scans, 'verdict': verdict}
+
+
+def explain_route(name, zone):
+    status, statements = capture(name, zone)
+    return status, [(sql, explain(sql, params)) for sql, params in statements]
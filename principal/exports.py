@@ -0,0 +1,250 @@
+"""
+Streaming CSV / XLSX exports.
+
+Rows come from ``QuerySet.iterator(chunk_size=EXPORT_CHUNK_SIZE)`` and are
+encoded one at a time, so memory stays flat however many rows there are.
+On PostgreSQL the iterator uses a server-side cursor; with
+DISABLE_SERVER_SIDE_CURSORS (the pgbouncer connection mode) psycopg reads
+the whole result client-side first.
+
+XLSX is written without a spreadsheet library: the workbook parts are
+fixed, and the sheet is streamed into a zip entry row by row.
+"""
+import csv
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+FORMATS = {
+    'csv':  'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# (header, queryset lookup)
+STUDENT_COLUMNS = [
+    ('Registration No',   'std_reg_no'),
+    ('Username',          'username'),
+    ('First Name',        'first_name'),
+    ('Last Name',         'last_name'),
+    ('Email',             'email'),
+    ('Department',        'std_dept__dept_name'),
+    ('Year of Admission', 'std_year_of_admission'),
+    ('Age',               'std_age'),
+    ('Phone',             'std_phone_no'),
+    ('Joined',            'date_joined'),
+    ('Courses',           'course_total'),
+    ('Approved',          'course_approved'),
+    ('Pending',           'course_pending'),
+    ('Rejected',          'course_rejected'),
+]
+
+COURSE_COLUMNS = [
+    ('Course ID',   'course_id'),
+    ('Course Name', 'course_name'),
+    ('Department',  'department__dept_name'),
+    ('Price',       'course_price'),
+    ('Enrolled',    'enrolled_count'),
+    ('Approved',    'approved_count'),
+    ('Pending',     'pending_count'),
+    ('Description', 'course_description'),
+]
+
+ENROLLMENT_COLUMNS = [
+    ('Request ID',      'pk'),
+    ('Registration No', 'student__std_reg_no'),
+    ('First Name',      'student__first_name'),
+    ('Last Name',       'student__last_name'),
+    ('Email',           'student__email'),
+    ('Course ID',       'course__course_id'),
+    ('Course Name',     'course__course_name'),
+    ('Department',      'course__department__dept_name'),
+    ('Price',           'course__course_price'),
+    ('Status',          'status'),
+    ('Requested',       'purchased_at'),
+    ('Approved At',     'approved_at'),
+]
+
+
+def student_rows(students):
+    students = students.annotate(
+        course_total=Count('course_purchases'),
+        course_approved=Count('course_purchases', filter=Q(course_purchases__status='APPROVED')),
+        course_pending=Count('course_purchases', filter=Q(course_purchases__status='PENDING')),
+        course_rejected=Count('course_purchases', filter=Q(course_purchases__status='REJECTED')),
+    )
+    return _rows(students, STUDENT_COLUMNS)
+
+
+def course_rows(courses):
+    return _rows(courses, COURSE_COLUMNS)
+
+
+def enrollment_rows(enrollments):
+    return _rows(enrollments.order_by('-pk'), ENROLLMENT_COLUMNS)
+
+
+def _rows(queryset, columns):
+    if not queryset.ordered:
+        queryset = queryset.order_by('pk')
+    yield [header for header, _ in columns]
+    yield from queryset.values_list(*[lookup for _, lookup in columns]).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def cell_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+# ------------------------------------------------------------------------------
+# CSV
+# ------------------------------------------------------------------------------
+class Echo:
+    """File-like object whose write() just hands the line back."""
+
+    def write(self, value):
+        return value
+
+
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    text = cell_text(value)
+    # Spreadsheet apps evaluate cells that look like formulas; names and
+    # emails are user input, so neutralise them.
+    if isinstance(value, str) and text.startswith(FORMULA_PREFIXES):
+        return "'" + text
+    return text
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    yield '\ufeff'  # BOM, lets Excel detect UTF-8
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+# ------------------------------------------------------------------------------
+# XLSX
+# ------------------------------------------------------------------------------
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+XLSX_SHEET_TAIL = '</sheetData></worksheet>'
+
+# Characters XML 1.0 does not allow, even escaped.
+XML_ILLEGAL_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+FLUSH_BYTES = 64 * 1024
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c><v>{value}</v></c>'
+    text = XML_ILLEGAL_RE.sub('', cell_text(value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+class ChunkSink:
+    """Write-only file for ZipFile; the generator drains it between rows."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks, self.size = self.chunks, [], 0
+        return chunks
+
+
+def stream_xlsx(rows, sheet_name='Sheet1'):
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        workbook.writestr('xl/workbook.xml', XLSX_WORKBOOK.format(name=escape(sheet_name[:31])))
+
+        with workbook.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(XLSX_SHEET_HEAD.encode())
+            for row in rows:
+                sheet.write(('<row>' + ''.join(_xlsx_cell(value) for value in row) + '</row>').encode())
+                if sink.size >= FLUSH_BYTES:
+                    yield from sink.drain()
+            sheet.write(XLSX_SHEET_TAIL.encode())
+    yield from sink.drain()
+
+
+def export_response(rows, filename, export_format):
+    """StreamingHttpResponse for ``rows`` (header first) as ``csv`` or ``xlsx``."""
+    if export_format == 'xlsx':
+        content = stream_xlsx(rows, sheet_name=filename)
+    else:
+        export_format = 'csv'
+        content = stream_csv(rows)
+
+    stamp = timezone.localdate().isoformat()
+    response = StreamingHttpResponse(content, content_type=FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{stamp}.{export_format}"'
+    return response
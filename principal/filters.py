@@ -0,0 +1,75 @@
+"""
+The ``q`` / ``dept`` / ``status`` filters shared by the principal list views
+and their exports, so an export always contains what the list shows.
+"""
+from django.db.models import Exists, OuterRef
+from student.models import Student, StudentCourse
+from principal.models import AddOnCourse
+from principal.search import search_students, search_courses
+
+
+STATUSES = frozenset(status for status, _ in StudentCourse.PURCHASE_STATUS)
+
+
+def parse_pk(value):
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else None
+
+
+def parse_status(value):
+    value = (value or '').strip().upper()
+    return value if value in STATUSES else None
+
+
+def filter_students(params):
+    """Students matching ``q``, ``dept`` and, with ``status``, having a request in that state."""
+    students = Student.objects.filter(role='STUDENT')
+
+    search_query = params.get('q', '')
+    if search_query:
+        students = search_students(students, search_query)
+
+    dept = parse_pk(params.get('dept'))
+    if dept:
+        students = students.filter(std_dept__pk=dept)
+
+    status = parse_status(params.get('status'))
+    if status:
+        students = students.filter(Exists(StudentCourse.objects.filter(student=OuterRef('pk'), status=status)))
+    return students
+
+
+def filter_courses(params):
+    courses = AddOnCourse.objects.all()
+
+    dept = parse_pk(params.get('dept'))
+    if dept:
+        courses = courses.filter(department__pk=dept)
+
+    search_query = params.get('q', '')
+    if search_query:
+        courses = search_courses(courses, search_query)
+    return courses
+
+
+def filter_enrollments(params):
+    """Requests whose student matches ``q``, in a course of ``dept`` / ``course``, with ``status``."""
+    enrollments = StudentCourse.objects.all()
+
+    search_query = params.get('q', '')
+    if search_query:
+        matching = search_students(Student.objects.all(), search_query).values('pk')
+        enrollments = enrollments.filter(student__in=matching)
+
+    dept = parse_pk(params.get('dept'))
+    if dept:
+        enrollments = enrollments.filter(course__department__pk=dept)
+
+    course = parse_pk(params.get('course'))
+    if course:
+        enrollments = enrollments.filter(course__pk=course)
+
+    status = parse_status(params.get('status'))
+    if status:
+        enrollments = enrollments.filter(status=status)
+    return enrollments
@@ -0,0 +1,81 @@
+"""
+Versioned template fragment cache.
+
+Each fragment names the models it depends on (``department``,
+``addoncourse``, ``studentcourse``, ``student``). Saving one of those bumps
+its version counter, which changes the key of every fragment that depends
+on it, so stale fragments are never read again and simply expire.
+
+The counters are VersionCounter rows rather than cache entries: a counter
+evicted from the cache would restart at an old version and bring back the
+fragments cached under it. Bumps made inside a transaction are collected
+and written once, after it commits, so a cascade or a bulk action costs
+one UPDATE and holds no lock on the counter rows while it runs.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from principal.models import VersionCounter
+from studentportal.routers import primary_reads
+
+
+FRAGMENT_CACHE   = getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'fragments')
+FRAGMENT_TIMEOUT = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 3600)
+
+DEPENDENCIES = ('department', 'addoncourse', 'studentcourse', 'student')
+
+
+def fragment_cache():
+    return caches[FRAGMENT_CACHE]
+
+
+def version_name(dependency):
+    return f'fragment:{dependency}'
+
+
+class PendingBumps:
+    """The on_commit callback for one transaction's bumps."""
+
+    def __init__(self):
+        self.names = set()
+
+    def __call__(self):
+        VersionCounter.bump(*sorted(self.names))
+
+
+_pending = threading.local()
+
+
+def bump_versions(*dependencies):
+    names      = [version_name(d) for d in dependencies]
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        VersionCounter.bump(*names)
+        return
+    # Reuse this transaction's callback while it is still queued; a rollback
+    # (of the transaction or of the savepoint that queued it) discards it.
+    pending = getattr(_pending, 'bumps', None)
+    if pending is None or not any(callback is pending for _, callback, _ in connection.run_on_commit):
+        pending = _pending.bumps = PendingBumps()
+        transaction.on_commit(pending)
+    pending.names.update(names)
+
+
+def fragment_versions():
+    """``{dependency: version}`` for every dependency, in one query."""
+    # From the primary: a lagging replica would hand out the version from before a write.
+    with primary_reads():
+        stored = dict(
+            VersionCounter.objects.filter(name__in=[version_name(d) for d in DEPENDENCIES])
+            .values_list('name', 'value')
+        )
+    return {d: stored.get(version_name(d), 1) for d in DEPENDENCIES}
+
+
+def fragment_key(name, depends, vary_on, versions):
+    version = '.'.join(str(versions[d]) for d in depends)
+    vary    = hashlib.md5(':'.join(str(v) for v in vary_on).encode()).hexdigest()
+    return f'fragment:{name}:{vary}:{version}'
@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from principal import benchmarks
+
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'query_baseline.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed synthetic data at several scales and record query count, wall time and '
+        'peak memory for every student/principal view and the POST scenarios of the '
+        'write endpoints. Fails on an unexpected status, or when a view\'s query '
+        'count grows with the data or exceeds the stored baseline. '
+        'Run with --settings=studentportal.settings_bench.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1000,10000',
+                            help='Comma-separated student counts, e.g. 1000,10000,100000.')
+        parser.add_argument('--courses', type=int, default=200)
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--update-baseline', action='store_true',
+                            help='Write the smallest scale\'s query counts as the new baseline.')
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'BENCHMARK_MODE', False):
+            raise CommandError('Refusing to seed this database; use --settings=studentportal.settings_bench.')
+
+        scales = sorted(int(s) for s in options['scales'].split(',') if s.strip())
+        call_command('migrate', verbosity=0, interactive=False)
+
+        results = {}
+        for scale in scales:
+            self.stdout.write(f'Seeding {scale} students / {options["courses"]} courses...')
+            results[scale] = benchmarks.run(scale, options['courses'])
+            for name, row in results[scale].items():
+                self.stdout.write(
+                    f'  {name:<22} {row["status"]:>4} {row["queries"]:>4} queries '
+                    f'{row["ms"]:>9.2f} ms {row["peak_kb"]:>10.1f} KiB'
+                )
+
+        baseline_path = Path(options['baseline'])
+        smallest = results[scales[0]]
+        if options['update_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(
+                {name: row['queries'] for name, row in sorted(smallest.items())}, indent=2,
+            ) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}.'))
+
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        failures = [
+            f'{name}: status {row["status"]} at {scale} students, expected {row["expected"]}'
+            for scale in scales for name, row in results[scale].items()
+            if row['status'] != row['expected']
+        ]
+        for name, row in smallest.items():
+            for scale in scales[1:]:
+                larger = results[scale][name]['queries']
+                if larger > row['queries']:
+                    failures.append(f'{name}: {row["queries"]} queries at {scales[0]} students, {larger} at {scale}')
+            if name in baseline and row['queries'] > baseline[name]:
+                failures.append(f'{name}: {row["queries"]} queries, baseline is {baseline[name]}')
+
+        if failures:
+            raise CommandError('Query regressions:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS('No query regressions.'))
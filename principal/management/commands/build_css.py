@@ -0,0 +1,46 @@
+import shlex
+import shutil
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile the Tailwind stylesheet: scan the templates (see tailwind.config.js) for '
+        'the classes they use and write one minified static/css/tailwind.css. Run before '
+        'collectstatic, which gives it a content-hashed name.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cli', default=getattr(settings, 'TAILWIND_CLI', ''),
+                            help='Tailwind command, e.g. "tailwindcss" or "npx --yes tailwindcss@3".')
+
+    def handle(self, *args, **options):
+        base   = Path(settings.BASE_DIR)
+        output = base / 'static' / getattr(settings, 'TAILWIND_CSS', 'css/tailwind.css')
+        cli    = shlex.split(options['cli']) if options['cli'] else self.find_cli()
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        command = cli + [
+            '--config', str(base / 'tailwind.config.js'),
+            '--input',  str(base / 'assets' / 'tailwind.css'),
+            '--output', str(output),
+            '--minify',
+        ]
+        try:
+            subprocess.run(command, cwd=base, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise CommandError(f'Tailwind build failed: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {output.relative_to(base)} ({output.stat().st_size / 1024:.1f} KiB).'))
+
+    def find_cli(self):
+        # The standalone binary if it is installed, otherwise npm's package.
+        if shutil.which('tailwindcss'):
+            return ['tailwindcss']
+        if shutil.which('npx'):
+            return ['npx', '--yes', 'tailwindcss@3']
+        raise CommandError('No Tailwind CLI found; install the standalone tailwindcss binary or Node.js, or pass --cli.')
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from student.images import render_derivatives
+from student.models import Student
+
+
+class Command(BaseCommand):
+    help = 'Generate the avatar/profile derivatives for students whose picture predates them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate derivatives that already exist.')
+
+    def handle(self, *args, **options):
+        students = Student.objects.exclude(std_pic='').exclude(std_pic__isnull=True)
+        if not options['all']:
+            # __in drops None, and rows from before student/0004 are NULL, not ''.
+            students = students.filter(Q(std_pic_avatar='') | Q(std_pic_avatar__isnull=True))
+
+        built = failed = 0
+        for student in students.iterator():
+            try:
+                with student.std_pic.open('rb') as pic:
+                    derivatives = render_derivatives(pic)
+            except (OSError, ValueError) as e:
+                failed += 1
+                self.stderr.write(f'{student.username}: {e}')
+                continue
+            for field, content in derivatives.items():
+                getattr(student, field).save(content.name, content, save=False)
+            student.save(update_fields=list(derivatives))
+            built += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Built derivatives for {built} student(s), {failed} failed.'))
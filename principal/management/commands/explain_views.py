@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from principal import benchmarks, explain
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed synthetic data, request every student/principal view and EXPLAIN each '
+        'SELECT it runs, reporting the indexes used and any full scan of a large table. '
+        'Run with --settings=studentportal.settings_bench, or pass --no-seed to explain '
+        'against the data already in the database (views that change state are skipped).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--courses', type=int, default=200)
+        parser.add_argument('--no-seed', action='store_true',
+                            help='Use the existing data instead of seeding.')
+        parser.add_argument('--view', action='append', dest='views',
+                            help='Only explain this route name (repeatable).')
+        parser.add_argument('--plans', action='store_true',
+                            help='Print the plan lines under each query.')
+        parser.add_argument('--fail-on-scan', action='store_true',
+                            help='Exit with an error if any query scans a large table in full.')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in explain.PLANNERS:
+            raise CommandError(f'explain_views reads {" and ".join(explain.PLANNERS)} query plans; this database is {connection.vendor}.')
+
+        if not options['no_seed']:
+            if not getattr(settings, 'BENCHMARK_MODE', False):
+                raise CommandError('Refusing to seed this database; use --settings=studentportal.settings_bench or --no-seed.')
+            call_command('migrate', verbosity=0, interactive=False)
+            self.stdout.write(f'Seeding {options["students"]} students / {options["courses"]} courses...')
+            benchmarks.seed(students=options['students'], courses=options['courses'])
+
+        # Planners pick indexes from table statistics; make sure they exist.
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        routes = [
+            (name, zone) for name, zone in benchmarks.benchmark_routes()
+            if name not in benchmarks.MUTATING_VIEWS
+            and (not options['views'] or name in options['views'])
+        ]
+
+        flagged = []
+        totals  = {'INDEX': 0, 'SMALL': 0, 'SCAN': 0}
+        for name, zone in sorted(routes):
+            status, queries = explain.explain_route(name, zone)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{name} ({status}, {len(queries)} selects)'))
+            for sql, plan in queries:
+                totals[plan['verdict']] += 1
+                style = self.style.WARNING if plan['verdict'] == 'SCAN' else (lambda text: text)
+                used  = ', '.join(dict.fromkeys(plan['indexes'])) or '-'
+                line  = f'  {plan["verdict"]:<5} {used}'
+                if plan['scans']:
+                    line += f'  [scans: {", ".join(dict.fromkeys(plan["scans"]))}]'
+                self.stdout.write(style(line))
+                self.stdout.write(f'        {" ".join(sql.split())[:160]}')
+                if options['plans']:
+                    for detail in plan['details']:
+                        self.stdout.write(f'          | {detail}')
+                if plan['verdict'] == 'SCAN':
+                    flagged.append(name)
+
+        self.stdout.write(
+            f'\n{totals["INDEX"]} queries use an index, {totals["SMALL"]} read only small tables, '
+            f'{totals["SCAN"]} scan a large table in full.'
+        )
+        if flagged and options['fail_on_scan']:
+            raise CommandError('Full scans of large tables in: ' + ', '.join(sorted(set(flagged))))
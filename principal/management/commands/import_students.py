@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from student.imports import StudentImporter, read_csv
+
+
+class Command(BaseCommand):
+    help = (
+        'Import students from a CSV with columns username, email, first_name, last_name, '
+        'std_reg_no and optionally department (name), year, age, phone, password.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file, or - for stdin.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Processes used to hash passwords (default: CPU count, 1 = in-process).')
+        parser.add_argument('--welcome', action='store_true', help='Queue the welcome email for every new student.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only; nothing is written.')
+
+    def handle(self, *args, **options):
+        importer = StudentImporter(
+            batch_size=max(1, options['batch_size']),
+            workers=options['workers'],
+            welcome=options['welcome'],
+            dry_run=options['dry_run'],
+        )
+        try:
+            if options['path'] == '-':
+                report = importer.run(read_csv(sys.stdin))
+            else:
+                with open(options['path'], newline='', encoding='utf-8-sig') as fileobj:
+                    report = importer.run(read_csv(fileobj))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for line, message in report.errors:
+            self.stderr.write(f'line {line}: {message}')
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        count = report.rows - len(report.errors) if options['dry_run'] else report.created
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {count} of {report.rows} row(s), {len(report.errors)} error(s) '
+            f'in {report.seconds:.1f}s ({report.rows_per_second:.0f} rows/s).'
+        ))
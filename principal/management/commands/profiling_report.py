@@ -0,0 +1,54 @@
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from studentportal.profiling import merge_snapshots, percentile
+
+
+class Command(BaseCommand):
+    help = 'Merge the rolling request profiles flushed by each worker and print per-route latency percentiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=settings.PROFILING_DIR)
+        parser.add_argument('--minutes', type=int, default=None, help='Only include the last N minutes.')
+        parser.add_argument('--json', action='store_true', help='Dump the merged histograms as JSON.')
+        parser.add_argument('--clear', action='store_true', help='Delete the snapshots after reporting.')
+
+    def handle(self, *args, **options):
+        paths = sorted(Path(options['dir']).glob('*.json'))
+        snapshots = []
+        for path in paths:
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+
+        since  = time.time() - options['minutes'] * 60 if options['minutes'] else None
+        merged = merge_snapshots(snapshots, since=since)
+
+        if options['json']:
+            self.stdout.write(json.dumps(merged, indent=2, default=dict))
+        elif not merged:
+            self.stdout.write('No profiles recorded yet.')
+        else:
+            self.stdout.write(
+                f'{"route":<32} {"n":>6} {"q/req":>6} {"maxq":>5} {"dups":>5} '
+                f'{"p50":>6} {"p95":>6} {"db95":>6} {"tpl95":>6} {"auth95":>6}'
+            )
+            for route, entry in sorted(merged.items(), key=lambda item: -item[1]['count']):
+                h = entry['histograms']
+                self.stdout.write(
+                    f'{route:<32} {entry["count"]:>6} {entry["queries"] / entry["count"]:>6.1f} '
+                    f'{entry["max_queries"]:>5} {entry["duplicates"]:>5} '
+                    f'{percentile(h["total"], .5):>6} {percentile(h["total"], .95):>6} '
+                    f'{percentile(h["db"], .95):>6} {percentile(h["template"], .95):>6} '
+                    f'{percentile(h["auth"], .95):>6}'
+                )
+                for fp, n in entry['fingerprints'].most_common(3):
+                    self.stdout.write(f'    x{n} {fp[:110]}')
+
+        if options['clear']:
+            for path in paths:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from principal.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the enrollment counters on courses and the course counts on departments.'
+
+    def handle(self, *args, **options):
+        courses, departments = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt counters for {courses} course(s) and {departments} department(s).'
+        ))
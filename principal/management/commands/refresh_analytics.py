@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from principal.analytics import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Update the enrollment analytics rollups from requests changed since the last run.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every rollup from scratch.')
+
+    def handle(self, *args, **options):
+        buckets = refresh_rollups(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Rewrote {buckets} course/day bucket(s).'))
@@ -0,0 +1,55 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from studentportal.routers import replica_aliases, replica_health
+
+
+def _sqlite_path(name):
+    # 'file:/path/db.sqlite3?mode=ro' -> '/path/db.sqlite3'
+    name = str(name)
+    if name.startswith('file:'):
+        name = name[len('file:'):].split('?', 1)[0]
+    return name
+
+
+class Command(BaseCommand):
+    help = (
+        'Probe every read replica the way the router does and report whether reads '
+        'would go to it. With --sync (SQLite only, see studentportal.settings_replicas) '
+        'first copy the primary database over each replica.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true',
+                            help='Copy the primary SQLite file onto each replica file.')
+
+    def handle(self, *args, **options):
+        aliases = replica_aliases()
+        if not aliases:
+            raise CommandError('No read replicas configured (DATABASE_REPLICAS is empty).')
+
+        if options['sync']:
+            primary = connections[DEFAULT_DB_ALIAS].settings_dict
+            if primary['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError('--sync only copies SQLite files; real replicas are kept up to date by the database.')
+            for alias in aliases:
+                connections[alias].close()
+                source = sqlite3.connect(_sqlite_path(primary['NAME']))
+                target = sqlite3.connect(_sqlite_path(connections[alias].settings_dict['NAME']))
+                with source, target:
+                    source.backup(target)
+                source.close()
+                target.close()
+                self.stdout.write(f'Copied {DEFAULT_DB_ALIAS} onto {alias}.')
+
+        down = 0
+        for alias in aliases:
+            healthy, detail = replica_health.probe(alias)
+            if healthy:
+                self.stdout.write(self.style.SUCCESS(f'{alias}: healthy, {detail}'))
+            else:
+                down += 1
+                self.stdout.write(self.style.WARNING(f'{alias}: DOWN, {detail} - its reads go to {DEFAULT_DB_ALIAS}'))
+        if down == len(aliases):
+            raise CommandError('No healthy replica; every read goes to the primary.')
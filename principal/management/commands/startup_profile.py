@@ -0,0 +1,70 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+IMPORT_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+# What a cold instance does before it can answer the first request.
+COLD_START = '\n'.join([
+    'from django.core.wsgi import get_wsgi_application',
+    'get_wsgi_application()',
+    'from django.urls import get_resolver',
+    'get_resolver().url_patterns',
+])
+
+# Packages worth watching, and whether a request can need them.
+WATCHED = {
+    'cloudinary':         'deferrable - template tags/fields only, not used by the project',
+    'cloudinary_storage': 'deferrable - app only adds management commands; media storage imports lazily',
+    'whitenoise':         'request path - static files middleware',
+    'decouple':           'request path - read by settings.py',
+}
+
+
+class Command(BaseCommand):
+    help = 'Profile module imports during a cold start (python -X importtime) and report the slowest packages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15)
+        parser.add_argument('--defer', action='store_true',
+                            help='Profile with DEFER_OPTIONAL_APPS=True for comparison.')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'studentportal.settings'))
+        if options['defer']:
+            env['DEFER_OPTIONAL_APPS'] = 'True'
+
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', COLD_START],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        self_us = defaultdict(int)
+        modules = defaultdict(int)
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE_RE.match(line)
+            if match:
+                package = match.group(4).split('.', 1)[0]
+                self_us[package] += int(match.group(1))
+                modules[package] += 1
+
+        total_ms = sum(self_us.values()) / 1000
+        self.stdout.write(f'Cold start imported {sum(modules.values())} modules in {total_ms:.0f} ms.\n')
+        self.stdout.write(f'{"package":<24} {"modules":>8} {"ms":>8} {"share":>6}')
+        for package, us in sorted(self_us.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'{package:<24} {modules[package]:>8} {us / 1000:>8.1f} {us / 10 / total_ms:>5.1f}%')
+
+        self.stdout.write('')
+        for package, note in WATCHED.items():
+            if package in self_us:
+                self.stdout.write(f'{package:<24} {self_us[package] / 1000:>8.1f} ms  {note}')
+            else:
+                self.stdout.write(f'{package:<24} {"-":>8}     not imported')
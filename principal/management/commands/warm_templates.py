@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from studentportal.templating import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Compile every project template into the cached loader; fails on template syntax errors.'
+
+    def handle(self, *args, **options):
+        compiled, errors, seconds = warm_templates()
+        for name, error in errors.items():
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'{len(errors)} template(s) failed to compile.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Compiled {len(compiled)} template(s) in {seconds * 1000:.0f} ms.'
+        ))
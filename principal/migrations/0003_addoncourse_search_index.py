@@ -0,0 +1,80 @@
+# Generated by Django 6.0.2 on 2026-10-18 09:12
+
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE principal_addoncourse ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, coalesce(course_name, '')), 'A') ||
+        setweight(to_tsvector('simple'::regconfig, coalesce(course_id, '')), 'A') ||
+        setweight(to_tsvector('simple'::regconfig, coalesce(course_description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX principal_addoncourse_search_gin ON principal_addoncourse USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS principal_addoncourse_search_gin",
+    "ALTER TABLE principal_addoncourse DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE principal_addoncourse_fts USING fts5(
+        course_name, course_id, course_description,
+        content='principal_addoncourse', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER principal_addoncourse_fts_ai AFTER INSERT ON principal_addoncourse BEGIN
+        INSERT INTO principal_addoncourse_fts(rowid, course_name, course_id, course_description)
+        VALUES (new.id, new.course_name, new.course_id, new.course_description);
+    END
+    """,
+    """
+    CREATE TRIGGER principal_addoncourse_fts_ad AFTER DELETE ON principal_addoncourse BEGIN
+        INSERT INTO principal_addoncourse_fts(principal_addoncourse_fts, rowid, course_name, course_id, course_description)
+        VALUES ('delete', old.id, old.course_name, old.course_id, old.course_description);
+    END
+    """,
+    """
+    CREATE TRIGGER principal_addoncourse_fts_au AFTER UPDATE OF course_name, course_id, course_description ON principal_addoncourse BEGIN
+        INSERT INTO principal_addoncourse_fts(principal_addoncourse_fts, rowid, course_name, course_id, course_description)
+        VALUES ('delete', old.id, old.course_name, old.course_id, old.course_description);
+        INSERT INTO principal_addoncourse_fts(rowid, course_name, course_id, course_description)
+        VALUES (new.id, new.course_name, new.course_id, new.course_description);
+    END
+    """,
+    "INSERT INTO principal_addoncourse_fts(principal_addoncourse_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS principal_addoncourse_fts_ai",
+    "DROP TRIGGER IF EXISTS principal_addoncourse_fts_ad",
+    "DROP TRIGGER IF EXISTS principal_addoncourse_fts_au",
+    "DROP TABLE IF EXISTS principal_addoncourse_fts",
+]
+
+
+def run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = {'postgresql': postgres, 'sqlite': sqlite}.get(schema_editor.connection.vendor, [])
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('principal', '0002_alter_department_dept_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
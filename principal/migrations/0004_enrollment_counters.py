@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    AddOnCourse   = apps.get_model('principal', 'AddOnCourse')
+    Department    = apps.get_model('principal', 'Department')
+    StudentCourse = apps.get_model('student', 'StudentCourse')
+
+    per_course = {}
+    for row in StudentCourse.objects.values('course', 'status').annotate(n=Count('pk')):
+        counts = per_course.setdefault(row['course'], {'enrolled_count': 0, 'approved_count': 0, 'pending_count': 0})
+        counts['enrolled_count'] += row['n']
+        if row['status'] in ('APPROVED', 'PENDING'):
+            counts[f"{row['status'].lower()}_count"] += row['n']
+    for pk, counts in per_course.items():
+        AddOnCourse.objects.filter(pk=pk).update(**counts)
+
+    for row in AddOnCourse.objects.exclude(department=None).values('department').annotate(n=Count('pk')):
+        Department.objects.filter(pk=row['department']).update(course_count=row['n'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('principal', '0003_addoncourse_search_index'),
+        ('student', '0003_student_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='addoncourse',
+            name='approved_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='addoncourse',
+            name='enrolled_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='addoncourse',
+            name='pending_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='course_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
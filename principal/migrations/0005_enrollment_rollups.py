@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('principal', '0004_enrollment_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EnrollmentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('request_count', models.IntegerField(default=0)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('approved_count', models.IntegerField(default=0)),
+                ('rejected_count', models.IntegerField(default=0)),
+                ('approved_revenue', models.BigIntegerField(default=0)),
+                ('approval_seconds', models.FloatField(default=0)),
+                ('approval_samples', models.IntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='principal.addoncourse')),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='rollups', to='principal.department')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='principal_rollup_day_idx'), models.Index(fields=['department', 'day'], name='principal_rollup_dept_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('course', 'day'), name='principal_rollup_course_day')],
+            },
+        ),
+    ]
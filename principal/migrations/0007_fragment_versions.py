@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-18 21:20
+
+from django.db import migrations
+
+
+FRAGMENT_DEPENDENCIES = ('department', 'addoncourse', 'studentcourse', 'student')
+
+
+def create_counters(apps, schema_editor):
+    # Present from the start, so bump_versions() is a single UPDATE.
+    VersionCounter = apps.get_model('principal', 'VersionCounter')
+    for dependency in FRAGMENT_DEPENDENCIES:
+        VersionCounter.objects.get_or_create(name=f'fragment:{dependency}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('principal', '0006_catalogue_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
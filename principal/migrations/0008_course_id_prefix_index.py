@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-18 22:12
+
+from django.db import migrations
+
+
+# The unique index on course_id only serves LIKE 'prefix%' under the C
+# collation; search_courses' prefix match needs a pattern_ops index.
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS principal_addoncourse_course_id_prefix ON principal_addoncourse (course_id varchar_pattern_ops)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS principal_addoncourse_course_id_prefix",
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for sql in statements:
+                schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('principal', '0007_fragment_versions'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgres(POSTGRES_FORWARD), run_on_postgres(POSTGRES_REVERSE)),
+    ]
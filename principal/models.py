@@ -1,23 +1,118 @@
 from django.db import models
 
-class Department(models.Model):
+
+class CounterFieldsMixin:
+    # Counter columns are only ever changed with F() updates (see
+    # principal.counters); a plain save() must not write back stale values.
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class Department(CounterFieldsMixin, models.Model):
     dept_name = models.CharField(max_length=200)
     dept_description = models.TextField()
+    course_count = models.IntegerField(default=0, editable=False)
+
+    counter_fields = ('course_count',)
 
     def __str__(self):
         return self.dept_name
 
-class AddOnCourse(models.Model):
+class AddOnCourse(CounterFieldsMixin, models.Model):
     course_id = models.CharField(max_length=20, unique=True, null=True, blank=True) 
     course_name = models.CharField(max_length=100)
     department = models.ForeignKey(Department, on_delete=models.CASCADE, null=True, blank=True)
     course_description = models.TextField()
     course_price = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+    enrolled_count = models.IntegerField(default=0, editable=False)
+    approved_count = models.IntegerField(default=0, editable=False)
+    pending_count = models.IntegerField(default=0, editable=False)
+
+    counter_fields = ('enrolled_count', 'approved_count', 'pending_count')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_department_id = instance.__dict__.get('department_id')
+        return instance
 
     def __str__(self):
         return f"{self.course_id or 'No ID'} - {self.course_name}"
     @property
     def formatted_price(self):
-        return f"₹{self.course_price:,}"
\ No newline at end of file
+        return f"₹{self.course_price:,}"
+
+
+class EnrollmentRollup(models.Model):
+    """
+    Request totals for one course on one day (of ``purchased_at``),
+    maintained by principal.analytics. Department and month figures are
+    sums over these rows.
+    """
+    day = models.DateField()
+    course = models.ForeignKey(AddOnCourse, on_delete=models.CASCADE, related_name='rollups')
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='rollups')
+    request_count = models.IntegerField(default=0)
+    pending_count = models.IntegerField(default=0)
+    approved_count = models.IntegerField(default=0)
+    rejected_count = models.IntegerField(default=0)
+    approved_revenue = models.BigIntegerField(default=0)
+    # Sum of approved_at - purchased_at over the approved requests that have an approved_at.
+    approval_seconds = models.FloatField(default=0)
+    approval_samples = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'day'], name='principal_rollup_course_day'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='principal_rollup_day_idx'),
+            models.Index(fields=['department', 'day'], name='principal_rollup_dept_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.course_id}: {self.request_count} requests"
+
+
+class AnalyticsWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
+
+
+class VersionCounter(models.Model):
+    """
+    A named counter that only goes up, e.g. the catalogue version behind
+    the catalogue API's ETags (see principal.catalogue) or the fragment
+    cache versions (principal.fragments). Kept in the database rather than
+    the cache so a restart or eviction can never hand out an old version
+    again.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=1)
+
+    @classmethod
+    def bump(cls, *names):
+        """Add one to each named counter; a missing counter starts at 2."""
+        updated = cls.objects.filter(name__in=names).update(value=models.F('value') + 1)
+        if updated < len(set(names)):
+            present = set(cls.objects.filter(name__in=names).values_list('name', flat=True))
+            for name in set(names) - present:
+                counter, created = cls.objects.get_or_create(name=name, defaults={'value': 2})
+                if not created:
+                    # Created by someone else since the UPDATE above.
+                    cls.objects.filter(pk=counter.pk).update(value=models.F('value') + 1)
+
+    def __str__(self):
+        return f"{self.name} v{self.value}"
@@ -0,0 +1,57 @@
+from django.conf import settings
+
+
+PAGE_SIZE          = getattr(settings, 'LIST_PAGE_SIZE', 50)
+MAX_PAGE_SIZE      = getattr(settings, 'LIST_MAX_PAGE_SIZE', 200)
+COUNT_ESTIMATE_CAP = getattr(settings, 'LIST_COUNT_ESTIMATE_CAP', 1000)
+
+
+def parse_cursor(value):
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        return None
+    return cursor if cursor > 0 else None
+
+
+def parse_page_size(value):
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_page(queryset, after=None, before=None, size=PAGE_SIZE):
+    """
+    Slice ``queryset`` newest-first on the primary key without OFFSET.
+
+    Returns ``(rows, next_cursor, prev_cursor)``; a cursor is the pk to pass
+    back as ``after`` (next page) or ``before`` (previous page).
+    """
+    if before:
+        rows     = list(queryset.filter(pk__gt=before).order_by('pk')[:size + 1])
+        has_more = len(rows) > size
+        rows     = rows[:size][::-1]
+        next_cursor = rows[-1].pk if rows else None
+        prev_cursor = rows[0].pk if has_more else None
+        return rows, next_cursor, prev_cursor
+
+    queryset = queryset.order_by('-pk')
+    if after:
+        queryset = queryset.filter(pk__lt=after)
+    rows     = list(queryset[:size + 1])
+    has_more = len(rows) > size
+    rows     = rows[:size]
+    next_cursor = rows[-1].pk if has_more else None
+    prev_cursor = rows[0].pk if after and rows else None
+    return rows, next_cursor, prev_cursor
+
+
+def estimate_count(queryset, cap=COUNT_ESTIMATE_CAP):
+    """
+    Count at most ``cap + 1`` rows. Returns ``(count, capped)`` so the UI can
+    show "1000+" instead of scanning the whole table.
+    """
+    count = queryset.order_by().values('pk')[:cap + 1].count()
+    return min(count, cap), count > cap
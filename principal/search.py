@@ -0,0 +1,102 @@
+"""
+Indexed search over students and courses.
+
+The index itself lives outside the ORM models and is created by
+``student/0003`` and ``principal/0003``:
+
+* PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index.
+* SQLite: an FTS5 external-content table kept in sync by triggers.
+
+Any other backend falls back to the old ``icontains`` filters.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query):
+    return TERM_RE.findall(query.lower())[:8]
+
+
+def _postgres_search(queryset, terms, ranked):
+    table   = queryset.model._meta.db_table
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    queryset = queryset.annotate(
+        search_hit=RawSQL(f"{table}.search_vector @@ to_tsquery('simple', %s)", (tsquery,), output_field=BooleanField()),
+    )
+    if ranked:
+        queryset = queryset.annotate(
+            search_rank=RawSQL(f"ts_rank({table}.search_vector, to_tsquery('simple', %s))", (tsquery,), output_field=FloatField()),
+        )
+    return queryset
+
+
+def _sqlite_search(queryset, terms, ranked):
+    table = queryset.model._meta.db_table
+    match = ' '.join(f'"{term}"*' for term in terms)
+    queryset = queryset.annotate(
+        search_hit=RawSQL(
+            f"{table}.id IN (SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH %s)",
+            (match,), output_field=BooleanField(),
+        ),
+    )
+    if ranked:
+        # bm25() is lower-is-better, negate it so both backends sort descending.
+        queryset = queryset.annotate(
+            search_rank=RawSQL(
+                f"COALESCE((SELECT -bm25({table}_fts) FROM {table}_fts WHERE {table}_fts MATCH %s AND rowid = {table}.id), 0)",
+                (match,), output_field=FloatField(),
+            ),
+        )
+    return queryset
+
+
+def _indexed_search(queryset, query, fallback, extra=None, ranked=True):
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none() if query.strip() else queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        queryset = _postgres_search(queryset, terms, ranked)
+    elif vendor == 'sqlite':
+        queryset = _sqlite_search(queryset, terms, ranked)
+    else:
+        return queryset.filter(fallback)
+
+    match = Q(search_hit=True)
+    if extra is not None:
+        match |= extra
+    queryset = queryset.filter(match)
+    return queryset.order_by('-search_rank', '-pk') if ranked else queryset
+
+
+def search_students(queryset, query):
+    fallback = (
+        Q(first_name__icontains=query) |
+        Q(last_name__icontains=query)  |
+        Q(email__icontains=query)       |
+        Q(std_reg_no__icontains=query)
+    )
+    # Registration numbers are matched by prefix, served on Postgres by the
+    # varchar_pattern_ops index from student/0007.
+    reg_prefix = Q(std_reg_no__startswith=query.strip().upper())
+    # The student list is keyset-paged by pk, which would throw a rank
+    # ordering away, so students are not ranked at all.
+    return _indexed_search(queryset, query, fallback, extra=reg_prefix, ranked=False)
+
+
+def search_courses(queryset, query):
+    fallback = (
+        Q(course_name__icontains=query) |
+        Q(course_id__icontains=query)   |
+        Q(course_description__icontains=query)
+    )
+    # Prefix match served on Postgres by the pattern_ops index from principal/0008.
+    course_prefix = Q(course_id__startswith=query.strip().upper())
+    return _indexed_search(queryset, query, fallback, extra=course_prefix)
@@ -0,0 +1,61 @@
+"""
+Keeps the SQLite FTS5 search tables from ``student/0003`` and
+``principal/0003`` wired up.
+
+SQLite rebuilds a table for most ALTERs (e.g. adding a column with a
+default), which silently drops the triggers attached to it. After every
+``migrate`` we recreate any missing trigger and reindex that table.
+"""
+from django.db.models.signals import post_migrate
+
+
+FTS_TABLES = {
+    'student_student':       ('first_name', 'last_name', 'email', 'std_reg_no'),
+    'principal_addoncourse': ('course_name', 'course_id', 'course_description'),
+}
+
+
+def trigger_sql(table, columns):
+    fts  = f'{table}_fts'
+    cols = ', '.join(columns)
+    new  = ', '.join(f'new.{c}' for c in columns)
+    old  = ', '.join(f'old.{c}' for c in columns)
+    return {
+        f'{fts}_ai': f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});
+            END""",
+        f'{fts}_ad': f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});
+            END""",
+        f'{fts}_au': f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});
+            END""",
+    }
+
+
+def ensure_sqlite_search_index(using='default', **kwargs):
+    from django.db import connections
+
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+        for table, columns in FTS_TABLES.items():
+            if f'{table}_fts' not in existing:
+                continue
+            missing = {name: sql for name, sql in trigger_sql(table, columns).items() if name not in existing}
+            for sql in missing.values():
+                cursor.execute(sql)
+            if missing:
+                cursor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def connect(sender):
+    post_migrate.connect(ensure_sqlite_search_index, sender=sender, dispatch_uid='principal.search_index')
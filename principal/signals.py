@@ -0,0 +1,105 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from student.models import Student, StudentCourse
+from principal.models import AddOnCourse, Department
+from principal.stats import invalidate_catalogue_summary
+from principal.fragments import bump_versions
+from principal.catalogue import bump_catalogue_version
+from principal.counters import (
+    apply_course_deltas, apply_department_delta, deleted_enrollment_deltas, enrollment_deltas, transition_deltas,
+)
+
+
+@receiver(post_save, sender=Student)
+def student_saved(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login; they don't change any dashboard totals.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_catalogue_summary()
+    bump_versions('student')
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=AddOnCourse)
+@receiver(post_delete, sender=AddOnCourse)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def catalogue_changed(sender, **kwargs):
+    invalidate_catalogue_summary()
+
+
+@receiver(post_save, sender=AddOnCourse)
+@receiver(post_delete, sender=AddOnCourse)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def catalogue_version_changed(sender, **kwargs):
+    bump_catalogue_version()
+
+
+@receiver(post_save, sender=StudentCourse)
+def enrollment_saved(sender, instance, created, **kwargs):
+    if created:
+        apply_course_deltas({instance.course_id: enrollment_deltas(instance.status)})
+    else:
+        old_status = getattr(instance, '_loaded_status', instance.status)
+        if old_status != instance.status:
+            apply_course_deltas({instance.course_id: transition_deltas(old_status, instance.status)})
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=StudentCourse)
+def enrollment_deleted(sender, instance, origin=None, **kwargs):
+    if StudentCourse.deleted_with_parent(origin):
+        return
+    status = getattr(instance, '_loaded_status', instance.status)
+    apply_course_deltas({instance.course_id: enrollment_deltas(status, sign=-1)})
+
+
+@receiver(pre_delete, sender=Student)
+def student_enrollments_deleted(sender, instance, origin=None, **kwargs):
+    # The cascade is about to delete the student's enrollments; count them
+    # off in one grouped query instead of once per row. A queryset delete
+    # sends this for every student, so it handles all of them on the first.
+    if isinstance(origin, QuerySet) and origin.model is Student:
+        if getattr(origin, '_enrollments_released', False):
+            return
+        origin._enrollments_released = True
+        enrollments = StudentCourse.objects.filter(student__in=origin)
+    else:
+        enrollments = StudentCourse.objects.filter(student=instance)
+    apply_course_deltas(deleted_enrollment_deltas(enrollments))
+    bump_versions('studentcourse')
+
+
+@receiver(pre_delete, sender=AddOnCourse)
+def course_enrollments_deleted(sender, instance, **kwargs):
+    # The course's own counters go with it; only the fragments need a bump.
+    bump_versions('studentcourse')
+
+
+@receiver(post_save, sender=AddOnCourse)
+def course_saved(sender, instance, created, **kwargs):
+    old_department_id = None if created else getattr(instance, '_loaded_department_id', instance.department_id)
+    if old_department_id != instance.department_id:
+        apply_department_delta(old_department_id, -1)
+        apply_department_delta(instance.department_id, 1)
+    instance._loaded_department_id = instance.department_id
+
+
+@receiver(post_delete, sender=AddOnCourse)
+def course_deleted(sender, instance, **kwargs):
+    apply_department_delta(getattr(instance, '_loaded_department_id', instance.department_id), -1)
+
+
+@receiver(post_save, sender=StudentCourse)
+@receiver(post_delete, sender=StudentCourse)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=AddOnCourse)
+@receiver(post_delete, sender=AddOnCourse)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def fragment_dependency_changed(sender, origin=None, **kwargs):
+    if sender is StudentCourse and StudentCourse.deleted_with_parent(origin):
+        return
+    bump_versions(sender._meta.model_name)
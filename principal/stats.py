@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from student.models import Student, StudentCourse
+from principal.models import AddOnCourse, Department
+from studentportal.routers import primary_reads
+
+
+SUMMARY_CACHE_KEY     = 'principal:dashboard:summary'
+SUMMARY_CACHE_TIMEOUT = getattr(settings, 'DASHBOARD_SUMMARY_TIMEOUT', 300)
+
+
+def enrollment_status_counts():
+    # One conditional aggregate instead of a COUNT per status.
+    return StudentCourse.objects.aggregate(
+        pending_count=Count('pk', filter=Q(status='PENDING')),
+        total_approved=Count('pk', filter=Q(status='APPROVED')),
+        total_rejected=Count('pk', filter=Q(status='REJECTED')),
+        total_requests=Count('pk'),
+    )
+
+
+def catalogue_summary():
+    summary = cache.get(SUMMARY_CACHE_KEY)
+    if summary is None:
+        with primary_reads():
+            summary = {
+                'total_students':    Student.objects.filter(role='STUDENT').count(),
+                'total_courses':     AddOnCourse.objects.count(),
+                'total_departments': Department.objects.count(),
+            }
+        cache.set(SUMMARY_CACHE_KEY, summary, SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_catalogue_summary():
+    cache.delete(SUMMARY_CACHE_KEY)
+
+
+def dashboard_stats():
+    stats = enrollment_status_counts()
+    stats.update(catalogue_summary())
+    return stats
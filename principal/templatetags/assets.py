@@ -0,0 +1,41 @@
+import logging
+from functools import cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+
+register = template.Library()
+logger   = logging.getLogger('studentportal.assets')
+
+TAILWIND_CSS          = getattr(settings, 'TAILWIND_CSS', 'css/tailwind.css')
+TAILWIND_CDN          = 'https://cdn.tailwindcss.com'
+TAILWIND_CDN_FALLBACK = getattr(settings, 'TAILWIND_CDN_FALLBACK', settings.DEBUG)
+
+
+@cache
+def _tailwind_tag():
+    if finders.find(TAILWIND_CSS) or staticfiles_storage.exists(TAILWIND_CSS):
+        try:
+            return format_html('<link rel="stylesheet" href="{}">', static(TAILWIND_CSS))
+        except ValueError:
+            pass  # built after collectstatic, so not in the manifest
+    if not TAILWIND_CDN_FALLBACK:
+        # principal.checks fails collectstatic before this can happen in a build.
+        logger.error('%s has not been built and TAILWIND_CDN_FALLBACK is off; pages are unstyled.', TAILWIND_CSS)
+        return ''
+    # Not built (a fresh checkout): compile in the browser as before.
+    return format_html('<script src="{}"></script>', TAILWIND_CDN)
+
+
+@register.simple_tag
+def tailwind_css():
+    """
+    The compiled Tailwind stylesheet. When it has not been built, the play
+    CDN script if TAILWIND_CDN_FALLBACK allows it, otherwise nothing.
+    """
+    return _tailwind_tag()
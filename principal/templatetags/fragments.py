@@ -0,0 +1,78 @@
+from django import template
+from django.template.base import token_kwargs
+from principal.fragments import DEPENDENCIES, FRAGMENT_TIMEOUT, fragment_cache, fragment_key, fragment_versions
+from studentportal.routers import primary_reads
+
+
+register = template.Library()
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary_on, depends, timeout):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+        self.depends = depends
+        self.timeout = timeout
+
+    def render(self, context):
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        timeout = self.timeout.resolve(context) if self.timeout else FRAGMENT_TIMEOUT
+        cache   = fragment_cache()
+
+        # Read once per template render (a child template and the base it
+        # extends share the render context).
+        versions = None
+        if self.depends:
+            versions = context.render_context.get(FragmentNode)
+            if versions is None:
+                versions = context.render_context[FragmentNode] = fragment_versions()
+        key = fragment_key(self.name, self.depends, vary_on, versions)
+
+        content = cache.get(key)
+        if content is None:
+            with primary_reads():
+                content = self.nodelist.render(context)
+            cache.set(key, content, timeout)
+        return content
+
+
+@register.tag('fragment')
+def do_fragment(parser, token):
+    """
+    Cache the enclosed block until one of its dependencies changes::
+
+        {% load fragments %}
+        {% fragment "dept_options" dept_filter depends="department" %}
+            ...
+        {% endfragment %}
+
+    Positional arguments after the name are vary-on values. ``depends`` is a
+    space-separated list of principal.fragments.DEPENDENCIES; ``timeout`` is
+    optional.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name.")
+
+    name = bits[1].strip('"\'')
+    vary_on, kwargs = [], {}
+    for bit in bits[2:]:
+        if '=' in bit:
+            kwargs.update(token_kwargs([bit], parser))
+        else:
+            vary_on.append(parser.compile_filter(bit))
+
+    depends = ()
+    if 'depends' in kwargs:
+        depends = tuple(kwargs.pop('depends').var.split())
+        unknown = set(depends) - set(DEPENDENCIES)
+        if unknown:
+            raise template.TemplateSyntaxError(f"Unknown fragment dependencies: {', '.join(sorted(unknown))}")
+    timeout = kwargs.pop('timeout', None)
+    if kwargs:
+        raise template.TemplateSyntaxError(f"Unexpected arguments to '{bits[0]}': {', '.join(kwargs)}")
+
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(nodelist, name, vary_on, depends, timeout)
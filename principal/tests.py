@@ -1,3 +1,205 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from principal import benchmarks
+from principal.checks import tailwind_css_built
+from principal.counters import rebuild_counters
+from principal.enrollments import pending_filter
+from principal.fragments import fragment_versions
+from principal.models import AddOnCourse, Department
+from student.models import Student, StudentCourse
+
+
+class PendingFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.science = Department.objects.create(dept_name='Science', dept_description='Science')
+        cls.arts    = Department.objects.create(dept_name='Arts', dept_description='Arts')
+        cls.physics = AddOnCourse.objects.create(course_id='PHY1', course_name='Physics', department=cls.science, course_description='')
+        cls.drawing = AddOnCourse.objects.create(course_id='ART1', course_name='Drawing', department=cls.arts, course_description='')
+        cls.principal = Student.objects.create_user(
+            username='principal', password='pw', email='principal@example.com', std_reg_no='P001', role='PRINCIPAL',
+        )
+        students = [
+            Student.objects.create_user(username=f's{i}', password='pw', email=f's{i}@example.com', std_reg_no=f'R{i:03}')
+            for i in range(2)
+        ]
+        cls.pending_physics = StudentCourse.objects.create(student=students[0], course=cls.physics)
+        cls.pending_drawing = StudentCourse.objects.create(student=students[1], course=cls.drawing)
+        cls.approved        = StudentCourse.objects.create(student=students[1], course=cls.physics, status='APPROVED')
+        # purchased_at is auto_now_add; backdate one request for the date filters.
+        StudentCourse.objects.filter(pk=cls.pending_drawing.pk).update(purchased_at=timezone.now() - timedelta(days=10))
+
+    def pks(self, requests):
+        return set(requests.values_list('pk', flat=True))
+
+    def test_no_selector_matches_nothing(self):
+        self.assertIsNone(pending_filter())
+        self.assertIsNone(pending_filter(ids=[], department='', purchased_from=''))
+
+    def test_ids_only_match_pending_requests(self):
+        requests = pending_filter(ids=[self.pending_physics.pk, self.approved.pk])
+        self.assertEqual(self.pks(requests), {self.pending_physics.pk})
+
+    def test_department_and_course(self):
+        self.assertEqual(self.pks(pending_filter(department=str(self.arts.pk))), {self.pending_drawing.pk})
+        self.assertEqual(self.pks(pending_filter(course=str(self.physics.pk))), {self.pending_physics.pk})
+
+    def test_purchase_dates(self):
+        cutoff = (timezone.now() - timedelta(days=5)).date().isoformat()
+        self.assertEqual(self.pks(pending_filter(purchased_from=cutoff)), {self.pending_physics.pk})
+        self.assertEqual(self.pks(pending_filter(purchased_to=cutoff)), {self.pending_drawing.pk})
+
+    def test_malformed_input_raises(self):
+        for kwargs in ({'department': 'abc'}, {'course': '-1'},
+                       {'purchased_from': '2024-13-45'}, {'purchased_to': 'yesterday'}):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                pending_filter(**kwargs)
+
+    def test_bulk_update_rejects_bad_input(self):
+        self.client.force_login(self.principal)
+        url = reverse('bulk_update_requests')
+
+        response = self.client.post(url, {'action': 'approve', 'purchased_from': 'not-a-date'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('purchased_from', response.json()['error'])
+
+        response = self.client.post(url, {'action': 'approve', 'dept': 'x', 'next': reverse('principal_dashboard')})
+        self.assertRedirects(response, reverse('principal_dashboard'), fetch_redirect_response=False)
+        self.assertEqual(StudentCourse.objects.filter(status='PENDING').count(), 2)
+
+    def test_bulk_update_approves_filtered_requests(self):
+        self.client.force_login(self.principal)
+
+        response = self.client.post(reverse('bulk_update_requests'), {'action': 'approve', 'dept': str(self.science.pk)})
+
+        self.assertEqual(response.json()['updated'], 1)
+        self.assertEqual(StudentCourse.objects.get(pk=self.pending_physics.pk).status, 'APPROVED')
+        self.assertEqual(StudentCourse.objects.get(pk=self.pending_drawing.pk).status, 'PENDING')
+        self.physics.refresh_from_db()
+        self.assertEqual((self.physics.pending_count, self.physics.approved_count), (0, 2))
+
+
+class CascadeDeleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        dept = Department.objects.create(dept_name='Science', dept_description='Science')
+        cls.courses = [
+            AddOnCourse.objects.create(course_id=f'SC{i}', course_name=f'Course {i}', department=dept, course_description='')
+            for i in range(4)
+        ]
+        cls.students = [
+            Student.objects.create_user(username=f's{i}', password='pw', email=f's{i}@example.com', std_reg_no=f'R{i:03}')
+            for i in range(3)
+        ]
+        statuses = ['PENDING', 'APPROVED', 'REJECTED', 'PENDING']
+        for student in cls.students[:2]:
+            for course, status in zip(cls.courses, statuses):
+                StudentCourse.objects.create(student=student, course=course, status=status)
+        StudentCourse.objects.create(student=cls.students[2], course=cls.courses[0])
+
+    def counters(self):
+        return [
+            (course.enrolled_count, course.pending_count, course.approved_count)
+            for course in AddOnCourse.objects.order_by('pk')
+        ]
+
+    def delete_queries(self, obj):
+        with CaptureQueriesContext(connection) as queries:
+            obj.delete()
+        return len(queries)
+
+    def test_student_delete_keeps_counters_right(self):
+        self.students[0].delete()
+        Student.objects.filter(pk=self.students[1].pk).delete()
+        counted = self.counters()
+
+        rebuild_counters()
+        self.assertEqual(self.counters(), counted)
+        self.assertEqual(counted[0], (1, 1, 0))
+
+    def test_cascade_cost_does_not_grow_with_enrollments(self):
+        # students[2] has one enrollment, students[0] four.
+        self.assertEqual(self.delete_queries(self.students[0]), self.delete_queries(self.students[2]))
+
+    def test_course_delete_cascade_is_set_based(self):
+        course = self.courses[0]  # three enrollments
+        single = self.courses[1]  # two enrollments
+        course_pk = course.pk
+        self.assertEqual(self.delete_queries(course), self.delete_queries(single))
+        self.assertFalse(StudentCourse.objects.filter(course=course_pk).exists())
+
+
+class FragmentVersionTests(TestCase):
+    def test_bumps_in_a_transaction_are_written_once_after_commit(self):
+        before = fragment_versions()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            dept    = Department.objects.create(dept_name='Science', dept_description='Science')
+            student = Student.objects.create_user(username='s', password='pw', email='s@example.com', std_reg_no='R001')
+            for i in range(3):
+                course = AddOnCourse.objects.create(course_id=f'SC{i}', course_name=f'Course {i}', department=dept, course_description='')
+                StudentCourse.objects.create(student=student, course=course)
+            self.assertEqual(fragment_versions(), before)
+
+        self.assertEqual(len(callbacks), 1)
+        after = fragment_versions()
+        self.assertEqual({name: after[name] - before[name] for name in after}, dict.fromkeys(after, 1))
+
+
+class BenchmarkMeasureTests(TestCase):
+    def test_query_count_survives_a_full_query_log(self):
+        benchmarks.seed(students=5, courses=3)
+        # Fill connection.queries past its 9000-entry cap, as seeding a large scale does.
+        connection.force_debug_cursor = True
+        try:
+            with connection.cursor() as cursor:
+                for _ in range(connection.queries_limit + 100):
+                    cursor.execute('SELECT 1')
+            row = benchmarks.measure('course', 'student')
+        finally:
+            connection.force_debug_cursor = False
+
+        self.assertEqual(row['status'], 200)
+        self.assertGreater(row['queries'], 0)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class BuildPicDerivativesTests(TestCase):
+    def test_builds_missing_derivatives_for_null_avatars(self):
+        buffer = BytesIO()
+        Image.new('RGB', (300, 200), 'red').save(buffer, 'PNG')
+        path    = default_storage.save('student_pic/old.png', ContentFile(buffer.getvalue()))
+        student = Student.objects.create_user(username='old', password='pw', email='old@example.com', std_reg_no='R900')
+        # Rows from before student/0004 have NULL derivatives, not ''.
+        Student.objects.filter(pk=student.pk).update(std_pic=path, std_pic_avatar=None, std_pic_profile=None)
+
+        call_command('build_pic_derivatives', stdout=StringIO())
+
+        student.refresh_from_db()
+        self.assertTrue(student.std_pic_avatar)
+        self.assertTrue(student.std_pic_profile)
+
+
+class TailwindCheckTests(TestCase):
+    @override_settings(TAILWIND_CDN_FALLBACK=False, TAILWIND_CSS='css/not-built.css')
+    def test_missing_stylesheet_fails_without_fallback(self):
+        self.assertEqual([error.id for error in tailwind_css_built(None)], ['principal.E001'])
+
+    @override_settings(TAILWIND_CDN_FALLBACK=True, TAILWIND_CSS='css/not-built.css')
+    def test_fallback_allows_missing_stylesheet(self):
+        self.assertEqual(tailwind_css_built(None), [])
+
+    @override_settings(TAILWIND_CDN_FALLBACK=False, TAILWIND_CSS='css/base.css')
+    def test_built_stylesheet_passes(self):
+        self.assertEqual(tailwind_css_built(None), [])
@@ -4,10 +4,16 @@ from . import views
 urlpatterns = [
     path('dashboard/',                    views.principal_dashboard, name='principal_dashboard'),
     path('students/',                     views.view_students,       name='view_students'),
+    path('students/export/',              views.export_students,     name='export_students'),
     path('students/<int:pk>/',            views.student_detail,      name='student_detail'),
     path('courses/',                      views.view_courses,        name='view_courses'),
+    path('courses/export/',               views.export_courses,      name='export_courses'),
     path('courses/add/',                  views.add_course,          name='add_course'),
     path('courses/delete/<int:pk>/',      views.delete_course,       name='delete_course'),
     path('courses/approve/<int:pk>/',     views.approve_course,      name='approve_course'),
     path('courses/reject/<int:pk>/',      views.reject_course,       name='reject_course'),
+    path('courses/requests/bulk/',        views.bulk_update_requests, name='bulk_update_requests'),
+    path('courses/requests/export/',      views.export_enrollments,  name='export_enrollments'),
+    path('analytics/',                    views.principal_analytics, name='principal_analytics'),
+    path('analytics/data/',               views.analytics_data,      name='analytics_data'),
 ]
\ No newline at end of file
@@ -1,35 +1,43 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.conf import settings
+from django.http import JsonResponse
+from django.template.defaultfilters import pluralize
+from django.urls import reverse
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
+from django.db.models import Exists, OuterRef
 from student.models import Student, StudentCourse
 from principal.models import AddOnCourse, Department
+from principal.stats import dashboard_stats
+from principal.filters import filter_students, filter_courses, filter_enrollments
+from principal.exports import export_response, student_rows, course_rows, enrollment_rows
+from principal.enrollments import BULK_ACTIONS, parse_ids, pending_filter, transition_requests, transition_request
+from principal.pagination import keyset_page, parse_cursor, parse_page_size, estimate_count
+from principal.analytics import DEFAULT_DAYS, GROUPS, PERIODS, last_refresh, rollup_report
+
+
+DASHBOARD_PENDING_LIMIT = getattr(settings, 'DASHBOARD_PENDING_LIMIT', 10)
 
 
 @login_required
 def principal_dashboard(request):
+    stats = dashboard_stats()
+
     pending_requests = StudentCourse.objects.filter(
         status='PENDING'
-    ).select_related('student__std_dept', 'course__department')
+    ).select_related('student__std_dept', 'course__department')[:DASHBOARD_PENDING_LIMIT]
 
+    # Only read when their cached fragment has expired, so they stay lazy
+    # and run (if at all) while the template renders.
     rejected_requests = StudentCourse.objects.filter(
         status='REJECTED'
     ).select_related('student', 'course').order_by('-purchased_at')[:5]
 
-    pending_count  = pending_requests.count()
-    total_approved = StudentCourse.objects.filter(status='APPROVED').count()
-    total_rejected = StudentCourse.objects.filter(status='REJECTED').count()
-    total_requests = StudentCourse.objects.count()
-
     context = {
-        'total_students':    Student.objects.filter(role='STUDENT').count(),
-        'total_courses':     AddOnCourse.objects.count(),
-        'total_departments': Department.objects.count(),
+        **stats,
         'pending_requests':  pending_requests,
-        'pending_count':     pending_count,
-        'total_approved':    total_approved,
-        'total_rejected':    total_rejected,
-        'total_requests':    total_requests,
         'recent_students':   Student.objects.select_related('std_dept').filter(role='STUDENT').order_by('-date_joined')[:5],
         'rejected_requests': rejected_requests,
     }
@@ -42,65 +50,55 @@ def view_students(request):
     dept_filter  = request.GET.get('dept', '')
     departments  = Department.objects.all()
 
-    students = Student.objects.select_related('std_dept').filter(role='STUDENT')
-
-    if search_query:
-        students = students.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query)  |
-            Q(email__icontains=search_query)       |
-            Q(std_reg_no__icontains=search_query)
-        )
-
-    if dept_filter:
-        students = students.filter(std_dept__pk=dept_filter)
+    students = filter_students(request.GET).select_related('std_dept')
 
-    students = students.annotate(
-        total_courses=Count('course_purchases'),
-        approved_count=Count(
-            'course_purchases',
-            filter=Q(course_purchases__status='APPROVED')
-        ),
+    page, next_cursor, prev_cursor = keyset_page(
+        students,
+        after=parse_cursor(request.GET.get('after')),
+        before=parse_cursor(request.GET.get('before')),
+        size=parse_page_size(request.GET.get('size')),
     )
 
-    total                   = students.count()
-    total_approved_students = Student.objects.filter(
-        role='STUDENT',
-        course_purchases__status='APPROVED'
-    ).distinct().count()
+    total, total_capped = estimate_count(students)
+    total_approved_students, approved_capped = estimate_count(
+        students.filter(Exists(StudentCourse.objects.filter(student=OuterRef('pk'), status='APPROVED')))
+    )
 
     return render(request, 'principal/principal_students_list.html', {
-        'students':                students,
+        'students':                page,
         'departments':             departments,
         'search_query':            search_query,
         'dept_filter':             dept_filter,
         'total':                   total,
+        'total_capped':            total_capped,
         'total_approved_students': total_approved_students,
+        'approved_capped':         approved_capped,
+        'next_cursor':             next_cursor,
+        'prev_cursor':             prev_cursor,
     })
 
 @login_required
 def student_detail(request, pk):
-    student = get_object_or_404(Student, pk=pk)
-
     if request.method == 'POST':
         action      = request.POST.get('action')
         purchase_id = request.POST.get('purchase_id')
         if purchase_id:
-            purchase = get_object_or_404(StudentCourse, pk=purchase_id)
+            purchase = get_object_or_404(StudentCourse.objects.select_related('course'), pk=purchase_id)
             if action == 'approve_purchase':
-                purchase.status = 'APPROVED'
-                purchase.save()
+                transition_request(purchase, 'APPROVED')
                 messages.success(request, f'Course "{purchase.course.course_name}" approved.')
             elif action == 'reject_purchase':
-                purchase.status = 'REJECTED'
-                purchase.save()
+                transition_request(purchase, 'REJECTED')
                 messages.error(request, f'Course "{purchase.course.course_name}" rejected.')
         return redirect('student_detail', pk=pk)
 
-    student_courses  = StudentCourse.objects.filter(student=student).select_related('course__department')
-    approved_courses = student_courses.filter(status='APPROVED')
-    pending_courses  = student_courses.filter(status='PENDING')
-    rejected_courses = student_courses.filter(status='REJECTED')
+    student = get_object_or_404(Student.objects.select_related('std_dept'), pk=pk)
+
+    # One query for every request, split by status here.
+    student_courses  = list(StudentCourse.objects.filter(student=student).select_related('course__department'))
+    approved_courses = [p for p in student_courses if p.status == 'APPROVED']
+    pending_courses  = [p for p in student_courses if p.status == 'PENDING']
+    rejected_courses = [p for p in student_courses if p.status == 'REJECTED']
     total_spent      = sum(p.course.course_price for p in approved_courses)
 
     return render(request, 'principal/principal_student_view.html', {
@@ -109,9 +107,9 @@ def student_detail(request, pk):
         'approved_courses': approved_courses,
         'pending_courses':  pending_courses,
         'rejected_courses': rejected_courses,
-        'approved_count':   approved_courses.count(),
-        'pending_count':    pending_courses.count(),
-        'rejected_count':   rejected_courses.count(),
+        'approved_count':   len(approved_courses),
+        'pending_count':    len(pending_courses),
+        'rejected_count':   len(rejected_courses),
         'total_spent':      total_spent,
     })
 
@@ -122,20 +120,7 @@ def view_courses(request):
     dept_filter  = request.GET.get('dept', '')
     search_query = request.GET.get('q', '')
 
-   
-    courses = AddOnCourse.objects.select_related('department').annotate(
-        enrolled_count=Count('student_purchases'),
-    )
-
-    if dept_filter:
-        courses = courses.filter(department__pk=dept_filter)
-
-    if search_query:
-        courses = courses.filter(
-            Q(course_name__icontains=search_query) |
-            Q(course_id__icontains=search_query)   |
-            Q(course_description__icontains=search_query)
-        )
+    courses = filter_courses(request.GET).select_related('department')
 
     total = courses.count()
 
@@ -150,6 +135,21 @@ def view_courses(request):
     })
 
 
+@login_required
+def export_students(request):
+    return export_response(student_rows(filter_students(request.GET)), 'students', request.GET.get('format'))
+
+
+@login_required
+def export_courses(request):
+    return export_response(course_rows(filter_courses(request.GET)), 'courses', request.GET.get('format'))
+
+
+@login_required
+def export_enrollments(request):
+    return export_response(enrollment_rows(filter_enrollments(request.GET)), 'enrollments', request.GET.get('format'))
+
+
 @login_required
 def add_course(request):
     if request.method == 'POST':
@@ -197,17 +197,99 @@ def delete_course(request, pk):
 
 @login_required
 def approve_course(request, pk):
-    req = get_object_or_404(StudentCourse, pk=pk)
-    req.status = 'APPROVED'
-    req.save()
+    req = get_object_or_404(StudentCourse.objects.select_related('student', 'course'), pk=pk)
+    transition_request(req, 'APPROVED')
     messages.success(request, f'Course "{req.course.course_name}" approved for {req.student.get_full_name()}.')
     return redirect('principal_dashboard')
 
 
 @login_required
 def reject_course(request, pk):
-    req = get_object_or_404(StudentCourse, pk=pk)
-    req.status = 'REJECTED'
-    req.save()
+    req = get_object_or_404(StudentCourse.objects.select_related('student', 'course'), pk=pk)
+    transition_request(req, 'REJECTED')
     messages.error(request, f'Course "{req.course.course_name}" rejected for {req.student.get_full_name()}.')
-    return redirect('principal_dashboard')
\ No newline at end of file
+    return redirect('principal_dashboard')
+
+
+@require_POST
+@login_required
+def bulk_update_requests(request):
+    data   = request.POST
+    action = data.get('action')
+    status = BULK_ACTIONS.get(action)
+    ids    = parse_ids(data.getlist('ids'))
+    next_url = data.get('next')
+    if next_url and not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = reverse('principal_dashboard')
+
+    error = None
+    try:
+        requests = pending_filter(
+            ids=ids,
+            department=data.get('dept'),
+            course=data.get('course'),
+            purchased_from=data.get('purchased_from'),
+            purchased_to=data.get('purchased_to'),
+        )
+    except ValueError as exc:
+        requests, error = None, str(exc)
+
+    if status is None or requests is None:
+        error = error or 'Choose approve or reject and at least one request or filter.'
+        if next_url:
+            messages.error(request, error)
+            return redirect(next_url)
+        return JsonResponse({'error': error}, status=400)
+
+    results = transition_requests(requests, status, ids=ids)
+    changed = sum(1 for outcome in results.values() if outcome == status)
+
+    if next_url:
+        messages.success(request, f'{changed} request{pluralize(changed)} {status.lower()}.')
+        return redirect(next_url)
+    return JsonResponse({
+        'action':  action,
+        'updated': changed,
+        'results': {str(pk): outcome for pk, outcome in results.items()},
+    })
+
+
+def analytics_params(request):
+    group  = request.GET.get('group', 'department')
+    period = request.GET.get('period', 'month')
+    try:
+        days = max(1, min(int(request.GET.get('days', DEFAULT_DAYS)), 3660))
+    except ValueError:
+        days = DEFAULT_DAYS
+    return (
+        group if group in GROUPS else 'department',
+        period if period in PERIODS else 'month',
+        days,
+    )
+
+
+@login_required
+def principal_analytics(request):
+    _, _, days = analytics_params(request)
+    totals = rollup_report('total', 'all', days)
+
+    return render(request, 'principal/principal_analytics.html', {
+        'days':          days,
+        'totals':        totals[0] if totals else None,
+        'monthly':       rollup_report('total', 'month', days),
+        'departments':   rollup_report('department', 'all', days),
+        'courses':       rollup_report('course', 'all', days)[:20],
+        'refreshed_at':  last_refresh(),
+    })
+
+
+@login_required
+def analytics_data(request):
+    group, period, days = analytics_params(request)
+    return JsonResponse({
+        'group':        group,
+        'period':       period,
+        'days':         days,
+        'refreshed_at': last_refresh(),
+        'rows':         rollup_report(group, period, days),
+    })
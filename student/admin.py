@@ -33,6 +33,7 @@ class StudentAdmin(UserAdmin):
 @admin.register(StudentCourse)
 class StudentCourseAdmin(admin.ModelAdmin):
     list_display = ('student', 'course', 'status', 'purchased_at', 'approved_at')
+    list_select_related = ('student', 'course')
     list_filter = ('status',)
     search_fields = ('student__std_reg_no', 'student__first_name', 'course__course_name')
     readonly_fields = ('purchased_at',)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class StudentConfig(AppConfig):
     name = 'student'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,116 @@
+"""
+Authentication backend that serves ``request.user`` from a cached snapshot.
+
+``ModelBackend.get_user`` runs one SELECT per request. Here the Student's
+column values (and those of its department) are kept in the cache under
+the user's pk, and the Student is rebuilt from them with ``from_db``, so
+an authenticated request reaches the database only for the view's own
+queries. Snapshots are written through on every ``Student.save()`` (after
+commit) and dropped on delete and on changes to the student's department
+(see student.signals).
+
+The snapshot holds every concrete column, password hash included, so
+Django's session-hash check and any ``request.user.save()`` behave
+exactly as with a user loaded from the database. That also means a
+snapshot must never outlive a password change or deactivation, so
+snapshots are only used when USER_CACHE_ALIAS is shared between workers
+(not a per-process LocMemCache) and USER_SNAPSHOT_TIMEOUT is positive.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from principal.models import Department
+from studentportal.routers import primary_reads
+from .models import Student
+
+
+USER_CACHE_ALIAS      = getattr(settings, 'USER_CACHE_ALIAS', 'default')
+USER_SNAPSHOT_TIMEOUT = getattr(settings, 'USER_SNAPSHOT_TIMEOUT', 300)
+
+
+def user_cache():
+    return caches[USER_CACHE_ALIAS]
+
+
+def snapshots_enabled():
+    # Invalidation in one worker's locmem never reaches the others.
+    return USER_SNAPSHOT_TIMEOUT > 0 and not isinstance(user_cache(), LocMemCache)
+
+
+def snapshot_key(user_id):
+    return f'student:snapshot:{user_id}'
+
+
+def _columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def _values(instance):
+    # get_prep_value turns FieldFiles back into plain names.
+    return [field.get_prep_value(getattr(instance, field.attname)) for field in instance._meta.concrete_fields]
+
+
+def take_snapshot(student):
+    """Column values of ``student`` and its department, or None if incomplete."""
+    if student.get_deferred_fields():
+        return None
+    dept = None
+    if student.std_dept_id:
+        # Only embed a department that is already loaded and current.
+        cached = Student.std_dept.field.get_cached_value(student, None)
+        if cached is None or cached.pk != student.std_dept_id or cached.get_deferred_fields():
+            return None
+        dept = _values(cached)
+    return {
+        'student': _values(student),
+        'dept':    dept,
+    }
+
+
+def from_snapshot(snapshot, using='default'):
+    student = Student.from_db(using, _columns(Student), snapshot['student'])
+    if snapshot['dept'] is not None:
+        dept = Department.from_db(using, _columns(Department), snapshot['dept'])
+        Student.std_dept.field.set_cached_value(student, dept)
+    return student
+
+
+def store_snapshot(student):
+    snapshot = take_snapshot(student)
+    if snapshot is None:
+        forget_snapshots([student.pk])
+    elif snapshots_enabled():
+        # Written after commit so a rolled-back save never reaches the cache.
+        transaction.on_commit(lambda: user_cache().set(snapshot_key(student.pk), snapshot, USER_SNAPSHOT_TIMEOUT))
+
+
+def forget_snapshots(user_ids):
+    keys = [snapshot_key(pk) for pk in user_ids]
+    if keys:
+        user_cache().delete_many(keys)
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        enabled  = snapshots_enabled()
+        cache    = user_cache()
+        key      = snapshot_key(user_id)
+        snapshot = cache.get(key) if enabled else None
+        if snapshot is not None:
+            user = from_snapshot(snapshot)
+        else:
+            try:
+                with primary_reads():
+                    user = Student._default_manager.select_related('std_dept').get(pk=user_id)
+            except Student.DoesNotExist:
+                return None
+            snapshot = take_snapshot(user) if enabled else None
+            if snapshot is not None:
+                cache.set(key, snapshot, USER_SNAPSHOT_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        return await sync_to_async(self.get_user)(user_id)
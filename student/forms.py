@@ -1,12 +1,33 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
+from django.core.files.uploadedfile import UploadedFile
 from django.core.validators import RegexValidator
 from .models import Student, StudentCourse
+from .images import render_derivatives, set_student_pic
 from principal.models import Department
 import datetime
 
 
-class StudentRegistrationForm(UserCreationForm):
+class StudentPicMixin:
+    """Renders the std_pic derivatives while validating, so a bad image is a form error."""
+
+    pic_derivatives = None
+
+    def clean_std_pic(self):
+        upload = self.cleaned_data.get('std_pic')
+        if isinstance(upload, UploadedFile):
+            try:
+                self.pic_derivatives = render_derivatives(upload)
+            except ValueError:
+                raise forms.ValidationError("Upload a valid image.")
+        return upload
+
+    def attach_pic(self, student):
+        if self.pic_derivatives is not None:
+            set_student_pic(student, self.cleaned_data['std_pic'], self.pic_derivatives)
+
+
+class StudentRegistrationForm(StudentPicMixin, UserCreationForm):
 
     email = forms.EmailField(
         required=True,
@@ -117,8 +138,7 @@ class StudentRegistrationForm(UserCreationForm):
         student.std_age = self.cleaned_data.get('std_age')
         student.std_phone_no = self.cleaned_data.get('std_phone_no', '')
         student.role = 'STUDENT'
-        if self.cleaned_data.get('std_pic'):
-            student.std_pic = self.cleaned_data['std_pic']
+        self.attach_pic(student)
         if commit:
             student.save()
         return student
@@ -139,7 +159,7 @@ class LoginForm(AuthenticationForm):
     )
 
 
-class StudentProfileUpdateForm(forms.ModelForm):
+class StudentProfileUpdateForm(StudentPicMixin, forms.ModelForm):
     class Meta:
         model = Student
         fields = [
@@ -165,6 +185,13 @@ class StudentProfileUpdateForm(forms.ModelForm):
             raise forms.ValidationError("This email is already registered.")
         return email
 
+    def save(self, commit=True):
+        student = super().save(commit=False)
+        self.attach_pic(student)
+        if commit:
+            student.save()
+        return student
+
 
 class StudentCourseForm(forms.ModelForm):
     class Meta:
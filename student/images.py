@@ -0,0 +1,82 @@
+"""
+Profile picture derivatives.
+
+Uploads to ``Student.std_pic`` are kept as-is, and square, EXIF-rotated,
+re-encoded copies are stored next to them in ``std_pic_avatar`` and
+``std_pic_profile``. Templates use the derivatives; the original is only
+kept for the record.
+"""
+from io import BytesIO
+from pathlib import PurePath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+
+# field -> edge in pixels (2x the largest size it is shown at)
+PIC_SIZES = {
+    'std_pic_avatar':  96,
+    'std_pic_profile': 256,
+}
+
+PIC_FORMAT  = getattr(settings, 'STUDENT_PIC_FORMAT', 'WEBP').upper()
+PIC_QUALITY = getattr(settings, 'STUDENT_PIC_QUALITY', 80)
+
+if PIC_FORMAT == 'WEBP' and not features.check('webp'):
+    PIC_FORMAT = 'JPEG'
+
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+
+def _flatten(image):
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        if PIC_FORMAT == 'WEBP':
+            return image
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_derivatives(upload):
+    """
+    Return ``{field: ContentFile}`` for every size in PIC_SIZES, or raise
+    ``ValueError`` if ``upload`` isn't an image Pillow can read.
+    """
+    upload.seek(0)
+    try:
+        with Image.open(upload) as image:
+            # Let the JPEG decoder downscale while reading; the phone photos
+            # and wallpapers people upload are many times the largest size.
+            largest = max(PIC_SIZES.values())
+            image.draft('RGB', (largest * 2, largest * 2))
+            image = _flatten(ImageOps.exif_transpose(image))
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise ValueError(f'Not a usable image: {exc}') from exc
+    finally:
+        upload.seek(0)
+
+    stem = PurePath(upload.name).stem
+    extension = EXTENSIONS[PIC_FORMAT]
+    derivatives = {}
+    for field, edge in PIC_SIZES.items():
+        thumb = ImageOps.fit(image, (edge, edge), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        thumb.save(buffer, PIC_FORMAT, quality=PIC_QUALITY, optimize=True)
+        derivatives[field] = ContentFile(buffer.getvalue(), name=f'{stem}_{edge}.{extension}')
+    return derivatives
+
+
+def set_student_pic(student, upload, derivatives=None):
+    """
+    Attach ``upload`` as the student's picture together with its derivatives
+    (rendered here unless passed in). Nothing is written until the student
+    is saved. Raises ``ValueError`` for unreadable images.
+    """
+    if derivatives is None:
+        derivatives = render_derivatives(upload)
+    student.std_pic = upload
+    for field, content in derivatives.items():
+        setattr(student, field, content)
@@ -0,0 +1,241 @@
+"""
+Bulk student import for ``manage.py import_students``.
+
+Rows are read from a CSV stream and handled in batches. Uniqueness of
+username / email / registration number is checked against sets loaded
+once up front (and extended as rows are accepted, so duplicates inside
+the file are caught too). Departments are resolved by name from a single
+map. Passwords are hashed in a process pool, and each batch is inserted
+with one ``bulk_create``.
+"""
+import csv
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from mailqueue.outbox import enqueue_many
+from principal.fragments import bump_versions
+from principal.models import Department
+from principal.stats import invalidate_catalogue_summary
+from .models import Student
+
+
+REQUIRED_COLUMNS = ('username', 'email', 'first_name', 'last_name', 'std_reg_no')
+OPTIONAL_COLUMNS = ('department', 'year', 'age', 'phone', 'password')
+
+PHONE_RE = re.compile(r'^\d{10}$')
+
+username_validator = UnicodeUsernameValidator()
+
+
+class RowError(ValueError):
+    pass
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.errors = []  # (line, message)
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _init_worker(settings_module):
+    # Spawned workers (macOS, Windows) start without settings; forked ones
+    # already have them and setup() is a no-op.
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def _optional_int(value, name, low, high):
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise RowError(f'{name} must be a number')
+    if not low <= number <= high:
+        raise RowError(f'{name} must be between {low} and {high}')
+    return number
+
+
+class StudentImporter:
+    def __init__(self, batch_size=1000, workers=None, welcome=False, dry_run=False):
+        self.batch_size = batch_size
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.welcome = welcome
+        self.dry_run = dry_run
+
+        self.usernames = set(Student.objects.values_list('username', flat=True).iterator())
+        self.emails    = {email.lower() for email in Student.objects.values_list('email', flat=True).iterator()}
+        self.reg_nos   = set(Student.objects.values_list('std_reg_no', flat=True).iterator())
+        self.departments = {name.casefold(): pk for pk, name in Department.objects.values_list('pk', 'dept_name')}
+
+    def clean(self, row):
+        """Validate one CSV row and return the Student field values (plus 'password')."""
+        values = {key: (row.get(key) or '').strip() for key in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}
+        missing = [key for key in REQUIRED_COLUMNS if not values[key]]
+        if missing:
+            raise RowError(f'missing {", ".join(missing)}')
+
+        username = values['username']
+        email    = Student.objects.normalize_email(values['email'])
+        reg_no   = values['std_reg_no']
+        try:
+            username_validator(username)
+            validate_email(email)
+        except ValidationError as e:
+            raise RowError(e.messages[0])
+        if len(username) > 150 or len(reg_no) > 12 or len(values['first_name']) > 30 or len(values['last_name']) > 150:
+            raise RowError('a value is longer than its column allows')
+
+        if username in self.usernames:
+            raise RowError(f'username "{username}" is already taken')
+        if email.lower() in self.emails:
+            raise RowError(f'email "{email}" is already registered')
+        if reg_no in self.reg_nos:
+            raise RowError(f'registration number "{reg_no}" is already in use')
+
+        department_id = None
+        if values['department']:
+            department_id = self.departments.get(values['department'].casefold())
+            if department_id is None:
+                raise RowError(f'unknown department "{values["department"]}"')
+
+        if values['phone'] and not PHONE_RE.match(values['phone']):
+            raise RowError('phone must be 10 digits')
+
+        fields = {
+            'username':              username,
+            'email':                 email,
+            'first_name':            values['first_name'],
+            'last_name':             values['last_name'],
+            'std_reg_no':            reg_no,
+            'std_dept_id':           department_id,
+            'std_year_of_admission': _optional_int(values['year'], 'year', 2000, 2100) or date.today().year,
+            'std_age':               _optional_int(values['age'], 'age', 10, 100),
+            'std_phone_no':          values['phone'] or None,
+            'password':              values['password'],
+        }
+        self.usernames.add(username)
+        self.emails.add(email.lower())
+        self.reg_nos.add(reg_no)
+        return fields
+
+    def hash_passwords(self, pool, batch):
+        # Blank passwords become unusable ones; those students use the reset flow.
+        raw = [fields['password'] for _, fields in batch]
+        to_hash = [password for password in raw if password]
+        if pool is not None and to_hash:
+            chunksize = max(1, len(to_hash) // (self.workers * 4))
+            hashed = iter(pool.map(make_password, to_hash, chunksize=chunksize))
+        else:
+            hashed = iter(map(make_password, to_hash))
+        return [next(hashed) if password else make_password(None) for password in raw]
+
+    def insert(self, batch, passwords, report):
+        students = []
+        for (_, fields), password in zip(batch, passwords):
+            students.append(Student(**{**fields, 'password': password}, role='STUDENT'))
+        try:
+            with transaction.atomic():
+                Student.objects.bulk_create(students)
+            report.created += len(students)
+            return students
+        except IntegrityError:
+            pass
+
+        # Someone registered a clashing student since the sets were loaded;
+        # fall back to row by row so only the clashing rows fail.
+        created = []
+        for (line, _), student in zip(batch, students):
+            student.pk = None
+            try:
+                with transaction.atomic():
+                    student.save(force_insert=True)
+            except IntegrityError as e:
+                report.error(line, f'conflict on insert: {e}')
+            else:
+                created.append(student)
+        report.created += len(created)
+        return created
+
+    def queue_welcome(self, students):
+        enqueue_many(
+            ('Welcome to Our Platform',
+             f'Hi {student.username},\n\nYour account has been created successfully!',
+             [student.email])
+            for student in students
+        )
+
+    def flush(self, pool, batch, report):
+        if not batch or self.dry_run:
+            return
+        created = self.insert(batch, self.hash_passwords(pool, batch), report)
+        if self.welcome and created:
+            self.queue_welcome(created)
+
+    def run(self, rows):
+        """Import ``(line, row_dict)`` pairs; returns an ImportReport."""
+        report = ImportReport()
+        pool = None
+        if self.workers > 1 and not self.dry_run:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'studentportal.settings'),),
+            )
+        try:
+            batch = []
+            for line, row in rows:
+                report.rows += 1
+                try:
+                    batch.append((line, self.clean(row)))
+                except RowError as e:
+                    report.error(line, str(e))
+                if len(batch) >= self.batch_size:
+                    self.flush(pool, batch, report)
+                    batch = []
+            self.flush(pool, batch, report)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if report.created:
+            # bulk_create sends no signals; refresh what the student signals would.
+            invalidate_catalogue_summary()
+            bump_versions('student')
+        report.finish()
+        return report
+
+
+def read_csv(fileobj):
+    """Yield ``(line_number, row)`` with lower-cased, stripped column names."""
+    reader = csv.DictReader(fileobj)
+    if reader.fieldnames is None:
+        return
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    missing = [column for column in REQUIRED_COLUMNS if column not in reader.fieldnames]
+    if missing:
+        raise ValueError(f'CSV is missing column(s): {", ".join(missing)}')
+    for row in reader:
+        yield reader.line_num, row
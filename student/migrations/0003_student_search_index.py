@@ -0,0 +1,82 @@
+# Generated by Django 6.0.2 on 2026-10-18 09:12
+
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE student_student ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple'::regconfig,
+            coalesce(first_name, '') || ' ' ||
+            coalesce(last_name, '') || ' ' ||
+            translate(coalesce(email, ''), '@.', '  ') || ' ' ||
+            coalesce(std_reg_no, ''))
+    ) STORED
+    """,
+    "CREATE INDEX student_student_search_gin ON student_student USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS student_student_search_gin",
+    "ALTER TABLE student_student DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE student_student_fts USING fts5(
+        first_name, last_name, email, std_reg_no,
+        content='student_student', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER student_student_fts_ai AFTER INSERT ON student_student BEGIN
+        INSERT INTO student_student_fts(rowid, first_name, last_name, email, std_reg_no)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.std_reg_no);
+    END
+    """,
+    """
+    CREATE TRIGGER student_student_fts_ad AFTER DELETE ON student_student BEGIN
+        INSERT INTO student_student_fts(student_student_fts, rowid, first_name, last_name, email, std_reg_no)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.std_reg_no);
+    END
+    """,
+    """
+    CREATE TRIGGER student_student_fts_au AFTER UPDATE OF first_name, last_name, email, std_reg_no ON student_student BEGIN
+        INSERT INTO student_student_fts(student_student_fts, rowid, first_name, last_name, email, std_reg_no)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.std_reg_no);
+        INSERT INTO student_student_fts(rowid, first_name, last_name, email, std_reg_no)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.std_reg_no);
+    END
+    """,
+    "INSERT INTO student_student_fts(student_student_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS student_student_fts_ai",
+    "DROP TRIGGER IF EXISTS student_student_fts_ad",
+    "DROP TRIGGER IF EXISTS student_student_fts_au",
+    "DROP TABLE IF EXISTS student_student_fts",
+]
+
+
+def run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = {'postgresql': postgres, 'sqlite': sqlite}.get(schema_editor.connection.vendor, [])
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0002_alter_student_std_reg_no'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0003_student_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='std_pic_avatar',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='student_pic/avatar'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='std_pic_profile',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='student_pic/profile'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:28
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    StudentCourse = apps.get_model('student', 'StudentCourse')
+    StudentCourse.objects.update(updated_at=Coalesce('approved_at', 'purchased_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0004_student_pic_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentcourse',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
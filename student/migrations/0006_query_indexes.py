@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('principal', '0005_enrollment_rollups'),
+        ('student', '0005_studentcourse_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['role', '-date_joined'], name='student_role_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['role', 'std_dept'], name='student_role_dept_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentcourse',
+            index=models.Index(fields=['status', '-purchased_at'], name='sc_status_purchased_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentcourse',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['-purchased_at'], name='sc_pending_purchased_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentcourse',
+            index=models.Index(fields=['student', 'status'], name='sc_student_status_idx'),
+        ),
+    ]
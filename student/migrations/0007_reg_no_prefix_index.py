@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-18 22:10
+
+from django.db import migrations
+
+
+# The unique index on std_reg_no only serves LIKE 'prefix%' under the C
+# collation; search_students' prefix match needs a pattern_ops index.
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS student_student_reg_no_prefix ON student_student (std_reg_no varchar_pattern_ops)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS student_student_reg_no_prefix",
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for sql in statements:
+                schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0006_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgres(POSTGRES_FORWARD), run_on_postgres(POSTGRES_REVERSE)),
+    ]
@@ -13,6 +13,9 @@ class Student(AbstractUser):
     role = models.CharField(max_length=20, choices=USER_ROLES, default='STUDENT')
     std_age = models.IntegerField(null=True, blank=True)
     std_pic = models.ImageField(upload_to="student_pic", null=True, blank=True)
+    # Square, re-encoded copies of std_pic made by student.images.
+    std_pic_avatar = models.ImageField(upload_to="student_pic/avatar", null=True, blank=True, editable=False)
+    std_pic_profile = models.ImageField(upload_to="student_pic/profile", null=True, blank=True, editable=False)
     std_reg_no = models.CharField(max_length=12, unique=True,default='0000')
     std_dept = models.ForeignKey(Department, on_delete=models.CASCADE, null=True, blank=True)
     std_year_of_admission = models.IntegerField(default=date.today().year)
@@ -31,9 +34,28 @@ class Student(AbstractUser):
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = ['email', 'first_name', 'last_name', 'std_reg_no']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Recent students on the dashboard and the student list.
+            models.Index(fields=['role', '-date_joined'], name='student_role_joined_idx'),
+            # Student list filtered by department.
+            models.Index(fields=['role', 'std_dept'], name='student_role_dept_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.std_reg_no} ({self.role})"
 
+    # Pictures uploaded before the derivatives existed fall back to the original.
+    @property
+    def avatar_url(self):
+        pic = self.std_pic_avatar or self.std_pic
+        return pic.url if pic else ''
+
+    @property
+    def profile_pic_url(self):
+        pic = self.std_pic_profile or self.std_pic
+        return pic.url if pic else ''
+
 
 class StudentCourse(models.Model):
     PURCHASE_STATUS = (
@@ -47,10 +69,40 @@ class StudentCourse(models.Model):
     status = models.CharField(max_length=20, choices=PURCHASE_STATUS, default='PENDING')
     purchased_at = models.DateTimeField(auto_now_add=True)
     approved_at = models.DateTimeField(null=True, blank=True)
+    # Watermark for the analytics rollups (principal.analytics); bulk
+    # updates must set it explicitly.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ('student', 'course')
         ordering = ['-purchased_at']
+        indexes = [
+            # Dashboard panels and bulk filters: status = X ORDER BY purchased_at DESC.
+            models.Index(fields=['status', '-purchased_at'], name='sc_status_purchased_idx'),
+            # The pending queue is the hot subset; keep a small index just for it.
+            models.Index(fields=['-purchased_at'], condition=models.Q(status='PENDING'), name='sc_pending_purchased_idx'),
+            # Per-student status counts (enrollment summary, approved-students filter).
+            models.Index(fields=['student', 'status'], name='sc_student_status_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    @staticmethod
+    def deleted_with_parent(origin):
+        """
+        Whether a delete signal's ``origin`` is the deletion of a student,
+        course or department rather than of enrollments themselves. Those
+        cascades are handled in bulk by the parents' pre_delete receivers,
+        so the per-row receivers skip them.
+        """
+        if origin is None:
+            return False
+        model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+        return model is not StudentCourse
 
     def __str__(self):
         return f"{self.student.std_reg_no} - {self.course.course_name} ({self.status})"
\ No newline at end of file
@@ -0,0 +1,85 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, OuterRef, Subquery
+from principal.models import AddOnCourse
+from principal.counters import apply_course_deltas, bulk_enrollment_deltas
+from principal.fragments import bump_versions
+from .models import Student, StudentCourse
+from .summary import invalidate_enrollment_summaries
+
+
+def parse_course_ids(raw):
+    ids = []
+    for part in raw.split(','):
+        part = part.strip()
+        if part.isdigit():
+            ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+
+def catalogue_with_status(student):
+    """
+    The courses ``student`` can request (their department's, or every course
+    when they have none), each with the student's request status or None.
+    One query, value rows with only the columns the purchase page shows.
+    """
+    status  = StudentCourse.objects.filter(student=student.pk, course=OuterRef('pk')).values('status')[:1]
+    courses = AddOnCourse.objects.all()
+    if student.std_dept_id:
+        courses = courses.filter(department_id=student.std_dept_id)
+
+    rows = list(
+        courses
+        .annotate(status=Subquery(status), dept_name=F('department__dept_name'))
+        .values('pk', 'course_id', 'course_name', 'course_description', 'course_price', 'dept_name', 'status')
+        .order_by('pk')
+    )
+    for row in rows:
+        row['formatted_price'] = f"₹{row['course_price']:,}"
+    return rows
+
+
+def _insert_requests(student, valid, course_ids):
+    """Insert the missing requests and count them; returns the ones that already existed."""
+    with transaction.atomic():
+        # Lock the student so concurrent purchases by them run one after the
+        # other and the rows read here are exactly the ones already there.
+        list(Student.objects.select_for_update().filter(pk=student.pk).values_list('pk'))
+        existing = dict(
+            StudentCourse.objects.filter(student=student, course__in=valid).values_list('course_id', 'status')
+        )
+        new_ids = [pk for pk in course_ids if pk in valid and pk not in existing]
+        # No ignore_conflicts: a row that fails to insert must not be counted.
+        StudentCourse.objects.bulk_create([StudentCourse(student=student, course_id=pk) for pk in new_ids])
+        # bulk_create sends no signals; bump the course counters directly.
+        apply_course_deltas(bulk_enrollment_deltas(new_ids))
+    return existing
+
+
+def purchase_courses(student, course_ids):
+    """
+    Request every course in ``course_ids`` for ``student`` in a fixed number
+    of queries. Returns ``{course_pk: outcome}`` where outcome is
+    ``'requested'``, ``'already_<status>'`` or ``'not_found'``.
+    """
+    if not course_ids:
+        return {}
+
+    valid = set(AddOnCourse.objects.filter(pk__in=course_ids).values_list('pk', flat=True))
+    try:
+        existing = _insert_requests(student, valid, course_ids)
+    except IntegrityError:
+        # A concurrent request inserted one of the rows first (only possible
+        # where SELECT ... FOR UPDATE is a no-op, e.g. SQLite); it's visible now.
+        existing = _insert_requests(student, valid, course_ids)
+    invalidate_enrollment_summaries([student.pk])
+    bump_versions('studentcourse')
+
+    results = {}
+    for pk in course_ids:
+        if pk not in valid:
+            results[pk] = 'not_found'
+        elif pk in existing:
+            results[pk] = f'already_{existing[pk].lower()}'
+        else:
+            results[pk] = 'requested'
+    return results
@@ -0,0 +1,54 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from principal.models import AddOnCourse, Department
+from .backends import forget_snapshots, store_snapshot
+from .models import Student, StudentCourse
+from .summary import invalidate_enrollment_summaries
+
+
+@receiver(post_save, sender=Student)
+def student_saved(sender, instance, **kwargs):
+    store_snapshot(instance)
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, **kwargs):
+    forget_snapshots([instance.pk])
+    invalidate_enrollment_summaries([instance.pk])
+
+
+@receiver(post_save, sender=Department)
+def department_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    # Snapshots embed the department row, enrollment summaries its name.
+    forget_snapshots(Student.objects.filter(std_dept=instance).values_list('pk', flat=True))
+    invalidate_enrollment_summaries(
+        StudentCourse.objects.filter(course__department=instance).values_list('student_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=StudentCourse)
+@receiver(post_delete, sender=StudentCourse)
+def enrollment_changed(sender, instance, origin=None, **kwargs):
+    # Cascades from a student or course delete are invalidated in bulk below.
+    if StudentCourse.deleted_with_parent(origin):
+        return
+    invalidate_enrollment_summaries([instance.student_id])
+
+
+@receiver(pre_delete, sender=AddOnCourse)
+def course_deleted(sender, instance, **kwargs):
+    invalidate_enrollment_summaries(
+        StudentCourse.objects.filter(course=instance).values_list('student_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=AddOnCourse)
+def course_changed(sender, instance, created, **kwargs):
+    # Summaries embed course name/price; drop the ones that show this course.
+    if created:
+        return
+    invalidate_enrollment_summaries(
+        StudentCourse.objects.filter(course=instance).values_list('student_id', flat=True)
+    )
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache
+from studentportal.routers import primary_reads
+from .models import StudentCourse
+
+
+SUMMARY_CACHE_TIMEOUT = getattr(settings, 'STUDENT_SUMMARY_TIMEOUT', 600)
+
+
+def summary_cache_key(student_id):
+    return f'student:enrollment-summary:{student_id}'
+
+
+def build_enrollment_summary(student_id):
+    rows = StudentCourse.objects.filter(student_id=student_id).order_by('-purchased_at').values(
+        'status', 'purchased_at',
+        'course__course_name', 'course__course_price', 'course__department__dept_name',
+    )
+
+    summary = {
+        'approved_courses': [],
+        'pending_courses':  [],
+        'rejected_courses': [],
+        'enrolled_courses': [],
+        'total_spent':      0,
+    }
+    for row in rows:
+        item = {
+            'status':       row['status'],
+            'purchased_at': row['purchased_at'],
+            'course': {
+                'course_name':     row['course__course_name'],
+                'department':      row['course__department__dept_name'],
+                'course_price':    row['course__course_price'],
+                'formatted_price': f"₹{row['course__course_price']:,}",
+            },
+        }
+        summary['enrolled_courses'].append(item)
+        summary[f"{row['status'].lower()}_courses"].append(item)
+        if row['status'] == 'APPROVED':
+            summary['total_spent'] += row['course__course_price']
+
+    summary['approved_count'] = len(summary['approved_courses'])
+    summary['pending_count']  = len(summary['pending_courses'])
+    summary['rejected_count'] = len(summary['rejected_courses'])
+    summary['recent_courses'] = summary['enrolled_courses'][:5]
+    return summary
+
+
+def get_enrollment_summary(student_id):
+    key     = summary_cache_key(student_id)
+    summary = cache.get(key)
+    if summary is None:
+        with primary_reads():
+            summary = build_enrollment_summary(student_id)
+        cache.set(key, summary, SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_enrollment_summaries(student_ids):
+    cache.delete_many([summary_cache_key(pk) for pk in set(student_ids)])
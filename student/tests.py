@@ -1,3 +1,99 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from principal.counters import rebuild_counters
+from principal.models import AddOnCourse, Department
+from student.models import Student, StudentCourse
+from student.purchases import parse_course_ids, purchase_courses
+from student.summary import get_enrollment_summary
+
+
+class PurchaseCoursesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dept    = Department.objects.create(dept_name='Science', dept_description='Science')
+        cls.courses = [
+            AddOnCourse.objects.create(course_id=f'SC{i}', course_name=f'Course {i}', department=cls.dept, course_description='')
+            for i in range(3)
+        ]
+        cls.student = Student.objects.create_user(
+            username='alice', password='pw', email='alice@example.com', std_reg_no='REG001', std_dept=cls.dept,
+        )
+
+    def counters(self, course):
+        course.refresh_from_db()
+        return course.enrolled_count, course.pending_count, course.approved_count
+
+    def test_parse_course_ids(self):
+        self.assertEqual(parse_course_ids('3, 1,x,3,,2'), [3, 1, 2])
+
+    def test_new_requests_are_counted(self):
+        first, second, _ = self.courses
+        results = purchase_courses(self.student, [first.pk, second.pk])
+
+        self.assertEqual(results, {first.pk: 'requested', second.pk: 'requested'})
+        self.assertEqual(StudentCourse.objects.filter(student=self.student, status='PENDING').count(), 2)
+        self.assertEqual(self.counters(first), (1, 1, 0))
+        self.assertEqual(self.counters(second), (1, 1, 0))
+
+    def test_existing_and_unknown_courses_are_not_counted(self):
+        first, second, third = self.courses
+        StudentCourse.objects.create(student=self.student, course=first, status='APPROVED')
+        missing = third.pk + 100
+
+        results = purchase_courses(self.student, [first.pk, second.pk, missing])
+
+        self.assertEqual(results, {first.pk: 'already_approved', second.pk: 'requested', missing: 'not_found'})
+        self.assertEqual(self.counters(first), (1, 0, 1))
+        self.assertEqual(self.counters(second), (1, 1, 0))
+        self.assertEqual(self.counters(third), (0, 0, 0))
+
+    def test_repeated_purchase_leaves_counters_unchanged(self):
+        course = self.courses[0]
+        purchase_courses(self.student, [course.pk])
+        results = purchase_courses(self.student, [course.pk])
+
+        self.assertEqual(results, {course.pk: 'already_pending'})
+        self.assertEqual(StudentCourse.objects.filter(student=self.student, course=course).count(), 1)
+        self.assertEqual(self.counters(course), (1, 1, 0))
+
+    def test_counters_match_a_rebuild(self):
+        purchase_courses(self.student, [course.pk for course in self.courses])
+        purchase_courses(self.student, [self.courses[0].pk])
+        counted = [self.counters(course) for course in self.courses]
+
+        rebuild_counters()
+        self.assertEqual([self.counters(course) for course in self.courses], counted)
+
+    def test_purchase_view(self):
+        self.client.force_login(self.student)
+        ids = ','.join(str(course.pk) for course in self.courses[:2])
+
+        response = self.client.post(reverse('purchase_course'), {'course_ids': ids})
+
+        self.assertRedirects(response, reverse('purchase_course'))
+        self.assertEqual(StudentCourse.objects.filter(student=self.student).count(), 2)
+
+
+class EnrollmentSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dept    = Department.objects.create(dept_name='Science', dept_description='Science')
+        cls.course  = AddOnCourse.objects.create(course_id='SC1', course_name='Physics', department=cls.dept, course_description='')
+        cls.student = Student.objects.create_user(username='bob', password='pw', email='bob@example.com', std_reg_no='REG002')
+        StudentCourse.objects.create(student=cls.student, course=cls.course)
+
+    def course_row(self):
+        return get_enrollment_summary(self.student.pk)['enrolled_courses'][0]['course']
+
+    def test_department_rename_reaches_cached_summary(self):
+        self.assertEqual(self.course_row()['department'], 'Science')
+        self.dept.dept_name = 'Natural Sciences'
+        self.dept.save()
+        self.assertEqual(self.course_row()['department'], 'Natural Sciences')
+
+    def test_course_rename_reaches_cached_summary(self):
+        self.assertEqual(self.course_row()['course_name'], 'Physics')
+        self.course.course_name = 'Applied Physics'
+        self.course.save()
+        self.assertEqual(self.course_row()['course_name'], 'Applied Physics')
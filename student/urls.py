@@ -11,6 +11,7 @@ urlpatterns = [
     path('course/', views.course, name='course'),
     path('profile/', views.profile, name='profile'),
     path('course-purchase/', views.purchase_course, name='purchase_course'), 
+    path('api/catalogue/', views.catalogue_api, name='catalogue_api'),
     
     
 ]
\ No newline at end of file
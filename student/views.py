@@ -2,11 +2,23 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import Student, StudentCourse
+from .models import Student
 from .forms import StudentRegistrationForm, LoginForm, StudentProfileUpdateForm
-from principal.models import AddOnCourse
-from django.core.mail import send_mail
-from django.conf import settings
+from .purchases import catalogue_with_status, parse_course_ids, purchase_courses
+from .images import set_student_pic
+from .summary import get_enrollment_summary
+from principal import catalogue
+from principal.filters import parse_pk
+from principal.pagination import parse_cursor, parse_page_size
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+from django.contrib.auth.tokens import default_token_generator
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from mailqueue.outbox import enqueue_mail
+from django.template.defaultfilters import pluralize
 
 def landing_view(request):
     return render(request, 'student/landing.html')
@@ -36,12 +48,10 @@ def register_view(request):
         if form.is_valid():
             student = form.save()
 
-            send_mail(
+            enqueue_mail(
                 subject='Welcome to Our Platform',
                 message=f'Hi {student.username},\n\nYour account has been created successfully!',
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[student.email],
-                fail_silently=False,
             )
 
             login(request, student)
@@ -62,40 +72,23 @@ def purchase_course(request):
     student = request.user
 
     if request.method == 'POST':
-        course_ids = request.POST.get('course_ids', '')
-        if course_ids:
-            ids = [i.strip() for i in course_ids.split(',') if i.strip()]
-            for course_id in ids:
-                try:
-                    course = AddOnCourse.objects.get(pk=course_id)
-                    StudentCourse.objects.get_or_create(student=student, course=course)
-                except (AddOnCourse.DoesNotExist, ValueError):
-                    pass
-            messages.success(request, 'Course purchase request submitted successfully!')
+        ids = parse_course_ids(request.POST.get('course_ids', ''))
+        if ids:
+            results   = purchase_courses(student, ids)
+            requested = sum(1 for outcome in results.values() if outcome == 'requested')
+            skipped   = len(results) - requested
+            if requested:
+                messages.success(request, 'Course purchase request submitted successfully!')
+            if skipped:
+                messages.info(request, f'{skipped} course{pluralize(skipped)} skipped (already requested or unavailable).')
         else:
             messages.error(request, 'No courses selected.')
         return redirect('purchase_course')
 
-    
-    if student.std_dept:
-        all_courses = AddOnCourse.objects.select_related('department').filter(department=student.std_dept)
-    else:
-        all_courses = AddOnCourse.objects.select_related('department').all()
-
-    purchased = StudentCourse.objects.filter(student=student).select_related('course')
-    purchased_map = {p.course.pk: p.status for p in purchased}
-
-    courses_with_status = []
-    for course in all_courses:
-        courses_with_status.append({
-            'course': course,
-            'status': purchased_map.get(course.pk),
-        })
-
+    courses_with_status = catalogue_with_status(student)
     context = {
         'courses_with_status': courses_with_status,
-        'total_courses': all_courses.count(),
-        'student_dept': student.std_dept,
+        'total_courses':       len(courses_with_status),
     }
     return render(request, 'student/purchasecourse.html', context)
 
@@ -104,7 +97,7 @@ def forgot_password(request):
         email = request.POST.get('email', '').strip()
         
         try:
-            user = User.objects.get(email=email)
+            user = Student.objects.get(email=email)
             # Generate token
             token = default_token_generator.make_token(user)
             uid = urlsafe_base64_encode(force_bytes(user.pk))
@@ -114,18 +107,16 @@ def forgot_password(request):
                 reverse('password_reset_confirm', kwargs={'uidb64': uid, 'token': token})
             )
             
-            # Send email
-            send_mail(
+            # Queue email
+            enqueue_mail(
                 subject='Password Reset - StudentManage',
                 message=f'Click the link below to reset your password:\n\n{reset_url}\n\nThis link expires in 24 hours.',
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[email],
-                fail_silently=False,
             )
             messages.success(request, 'Reset link sent! Please check your inbox.')
             return redirect('forgot_password')
         
-        except User.DoesNotExist:
+        except Student.DoesNotExist:
             # Don't reveal whether email exists (security best practice)
             messages.success(request, 'If that email is registered, a reset link has been sent.')
             return redirect('forgot_password')
@@ -143,9 +134,13 @@ def profile(request):
        
         if update_type == 'profile_pic':
             if request.FILES.get('std_pic'):
-                student.std_pic = request.FILES['std_pic']
-                student.save()
-                messages.success(request, 'Profile picture updated successfully!')
+                try:
+                    set_student_pic(student, request.FILES['std_pic'])
+                except ValueError:
+                    messages.error(request, 'That file is not an image we can read.')
+                else:
+                    student.save(update_fields=['std_pic', 'std_pic_avatar', 'std_pic_profile'])
+                    messages.success(request, 'Profile picture updated successfully!')
             else:
                 messages.error(request, 'Please select an image to upload.')
             return redirect('profile')
@@ -173,26 +168,42 @@ def profile(request):
 @login_required
 def student_dashboard(request):
     student = request.user
-    enrolled_courses = StudentCourse.objects.filter(student=student).select_related('course__department')
-    approved = enrolled_courses.filter(status='APPROVED')
-    pending = enrolled_courses.filter(status='PENDING')
-    rejected = enrolled_courses.filter(status='REJECTED')
-    
-    total_spent = sum(item.course.course_price for item in approved)
-
     context = {
         'student': student,
-        'enrolled_courses': enrolled_courses,
-        'approved_courses': approved,
-        'pending_courses': pending,
-        'rejected_courses': rejected,
-        'total_spent': total_spent,
+        **get_enrollment_summary(student.pk),
     }
     return render(request, 'student/student_dashboard.html', context)
 def course(request):
     return render(request, 'student/course.html')
 
 
+@require_GET
+def catalogue_api(request):
+    """
+    Read-only course catalogue: ``?dept=<pk>&after=<cursor>&before=<cursor>&size=<n>``.
+    Answers ``If-None-Match`` with 304 while the catalogue version is unchanged.
+    """
+    version = catalogue.catalogue_version()
+    params  = {
+        'dept':   parse_pk(request.GET.get('dept')),
+        'after':  parse_cursor(request.GET.get('after')),
+        'before': parse_cursor(request.GET.get('before')),
+        'size':   parse_page_size(request.GET.get('size')),
+    }
+    etag = catalogue.catalogue_etag(version, **params)
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(catalogue.catalogue_page(version, **params))
+    response['ETag'] = etag
+    patch_cache_control(
+        response, public=True,
+        max_age=catalogue.MAX_AGE,
+        s_maxage=catalogue.SHARED_MAX_AGE,
+    )
+    return response
+
+
 def logout_view(request):
     logout(request)
     messages.success(request, 'You have been successfully logged out!')
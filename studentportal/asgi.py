@@ -2,6 +2,7 @@
 ASGI config for studentportal project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+It defaults to the ASGI deployment profile in studentportal.settings_asgi.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -11,6 +12,6 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studentportal.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studentportal.settings_asgi')
 
 application = get_asgi_application()
@@ -0,0 +1,223 @@
+"""
+Sampled request profiling.
+
+``middleware.ProfilingMiddleware`` opens a ``RequestProfile`` for a sample of
+requests and stores it in ``current_profile``. The DB execute wrapper, the
+template backend below and ``middleware.ProfilingAuthMiddleware`` add their
+timings to it. Finished profiles are folded into a rolling per-route
+histogram that each worker process flushes to ``PROFILING_DIR``;
+``manage.py profiling_report`` merges those snapshots.
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates
+
+
+current_profile = ContextVar('current_profile', default=None)
+
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+METRICS    = ('total', 'db', 'template', 'auth')
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+NUMBER_RE  = re.compile(r'\b\d+\b')
+
+
+def fingerprint(sql):
+    return NUMBER_RE.sub('?', IN_LIST_RE.sub('IN (...)', sql))
+
+
+class RequestProfile:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.total_seconds = 0.0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.auth_seconds = 0.0
+        self.query_count = 0
+        self.statements = Counter()
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.query_count += 1
+            self.statements[(sql, repr(params))] += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def finish(self):
+        self.total_seconds = time.perf_counter() - self.start
+
+    @property
+    def duplicate_count(self):
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def repeated_fingerprints(self):
+        return {fp: n for fp, n in self.fingerprints.items() if n > 1}
+
+    def timings_ms(self):
+        return {
+            'total':    self.total_seconds * 1000,
+            'db':       self.db_seconds * 1000,
+            'template': self.template_seconds * 1000,
+            'auth':     self.auth_seconds * 1000,
+        }
+
+    def server_timing(self):
+        ms = self.timings_ms()
+        return ', '.join([
+            f'total;dur={ms["total"]:.1f}',
+            f'db;dur={ms["db"]:.1f};desc="{self.query_count} queries, {self.duplicate_count} duplicate"',
+            f'tpl;dur={ms["template"]:.1f}',
+            f'auth;dur={ms["auth"]:.1f};desc="session+user"',
+        ])
+
+
+def empty_window(started):
+    return {
+        'started': started,
+        'routes':  {},
+    }
+
+
+def bucket_index(ms):
+    for i, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+class RollingHistogram:
+    """
+    Per-route latency histograms over the last ``windows`` windows of
+    ``window_seconds`` each. Thread-safe; one instance per process.
+    """
+
+    def __init__(self, window_seconds=300, windows=12):
+        self.window_seconds = window_seconds
+        self.windows = deque(maxlen=windows)
+        self.lock = threading.Lock()
+        self.last_flush = time.time()
+
+    def _current(self, now):
+        if not self.windows or now - self.windows[-1]['started'] >= self.window_seconds:
+            self.windows.append(empty_window(now))
+        return self.windows[-1]
+
+    def record(self, route, profile):
+        now = time.time()
+        with self.lock:
+            window = self._current(now)
+            entry = window['routes'].setdefault(route, {
+                'count':       0,
+                'queries':     0,
+                'max_queries': 0,
+                'duplicates':  0,
+                'histograms':  {metric: [0] * (len(BUCKETS_MS) + 1) for metric in METRICS},
+                'fingerprints': {},
+            })
+            entry['count'] += 1
+            entry['queries'] += profile.query_count
+            entry['max_queries'] = max(entry['max_queries'], profile.query_count)
+            entry['duplicates'] += profile.duplicate_count
+            for metric, ms in profile.timings_ms().items():
+                entry['histograms'][metric][bucket_index(ms)] += 1
+            for fp, n in profile.repeated_fingerprints().items():
+                entry['fingerprints'][fp] = max(entry['fingerprints'].get(fp, 0), n)
+
+    def snapshot(self):
+        with self.lock:
+            return {'pid': os.getpid(), 'windows': list(self.windows)}
+
+    def maybe_flush(self, directory, interval):
+        now = time.time()
+        if now - self.last_flush < interval:
+            return
+        self.last_flush = now
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+
+
+histogram = RollingHistogram(
+    window_seconds=getattr(settings, 'PROFILING_WINDOW_SECONDS', 300),
+    windows=getattr(settings, 'PROFILING_WINDOWS', 12),
+)
+
+
+def merge_snapshots(snapshots, since=None):
+    merged = {}
+    for snapshot in snapshots:
+        for window in snapshot['windows']:
+            if since is not None and window['started'] < since:
+                continue
+            for route, entry in window['routes'].items():
+                target = merged.setdefault(route, {
+                    'count': 0, 'queries': 0, 'max_queries': 0, 'duplicates': 0,
+                    'histograms': {metric: [0] * (len(BUCKETS_MS) + 1) for metric in METRICS},
+                    'fingerprints': Counter(),
+                })
+                target['count'] += entry['count']
+                target['queries'] += entry['queries']
+                target['max_queries'] = max(target['max_queries'], entry['max_queries'])
+                target['duplicates'] += entry['duplicates']
+                for metric in METRICS:
+                    for i, n in enumerate(entry['histograms'][metric]):
+                        target['histograms'][metric][i] += n
+                for fp, n in entry['fingerprints'].items():
+                    target['fingerprints'][fp] = max(target['fingerprints'][fp], n)
+    return merged
+
+
+def percentile(buckets, fraction):
+    """Upper bucket bound (ms) under which ``fraction`` of samples fall."""
+    total = sum(buckets)
+    if not total:
+        return 0
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= total * fraction:
+            return BUCKETS_MS[i] if i < len(BUCKETS_MS) else float('inf')
+    return float('inf')
+
+
+class ProfiledTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        profile = current_profile.get()
+        if profile is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            profile.template_seconds += time.perf_counter() - start
+
+
+class ProfiledDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend that reports render time to the current profile."""
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name))
@@ -0,0 +1,178 @@
+"""
+Read-replica routing.
+
+``middleware.ReplicaRoutingMiddleware`` opens a ``RoutingState`` for every
+request. Reads made while serving a GET go to one of DATABASE_REPLICAS
+(the same one for the whole request). These always go to ``default``:
+
+* every write;
+* every read outside a request, such as management commands or the mail worker;
+* reads inside a transaction;
+* sessions.
+
+Read-your-writes: once a request writes (any POST, or a GET that happens to
+save something) its remaining reads go to the primary, and the middleware
+pins the client to the primary for REPLICA_STICKY_SECONDS with a cookie, so
+the pages that follow don't read from a replica that hasn't caught up yet.
+
+Reads that fill a long-lived cache run inside ``primary_reads()``: cache
+invalidation happens at write time, so a lagging replica would otherwise
+put the old data straight back under the new key.
+
+Replicas are probed (a connect and a query, plus replay lag on Postgres) at
+most every REPLICA_HEALTH_INTERVAL seconds per process. One that fails is
+skipped for REPLICA_RETRY_SECONDS and its reads fall back to the primary.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+logger = logging.getLogger('studentportal.replicas')
+
+current_routing = ContextVar('current_routing', default=None)
+force_primary   = ContextVar('force_primary', default=False)
+
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'TRACE'})
+
+# Written on one request and read back on the next; never worth the lag.
+PRIMARY_ONLY_APPS = frozenset({'sessions'})
+
+PIN_COOKIE = getattr(settings, 'REPLICA_PIN_COOKIE', 'db_primary')
+
+# Seconds of WAL replay the replica is behind; 0 when it has replayed
+# everything it received (an idle primary is not lag).
+PG_LAG_SQL = (
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END'
+)
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+class ReplicaHealth:
+    """Per-process health of each replica alias, re-probed when stale."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._status = {}  # alias -> (healthy, checked_at, detail)
+
+    def probe(self, alias):
+        """Check ``alias`` now and return ``(healthy, detail)``."""
+        connection = connections[alias]
+        max_lag    = getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 0)
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute(PG_LAG_SQL)
+                    lag = float(cursor.fetchone()[0] or 0)
+                else:
+                    # A replica without the schema is no better than a dead one.
+                    cursor.execute('SELECT 1 FROM django_migrations LIMIT 1')
+                    lag = None
+        except DatabaseError as exc:
+            return False, f'unreachable: {exc}'
+        if lag is None:
+            return True, 'reachable'
+        if max_lag and lag > max_lag:
+            return False, f'{lag:.1f}s behind (limit {max_lag}s)'
+        return True, f'{lag:.1f}s behind'
+
+    def record(self, alias, healthy, detail):
+        with self._lock:
+            previous = self._status.get(alias)
+            self._status[alias] = (healthy, time.monotonic(), detail)
+        if previous is not None and previous[0] == healthy:
+            return
+        if healthy:
+            logger.info('Replica %s is healthy (%s).', alias, detail)
+        else:
+            logger.warning('Replica %s is down, reading from the primary: %s', alias, detail)
+
+    def mark_down(self, alias, detail):
+        self.record(alias, False, detail)
+
+    def is_healthy(self, alias):
+        with self._lock:
+            status = self._status.get(alias)
+        if status is not None:
+            healthy, checked_at, _ = status
+            wait = getattr(settings, 'REPLICA_HEALTH_INTERVAL', 10) if healthy else getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+            if time.monotonic() - checked_at < wait:
+                return healthy
+        healthy, detail = self.probe(alias)
+        self.record(alias, healthy, detail)
+        return healthy
+
+
+replica_health = ReplicaHealth()
+
+
+def choose_replica():
+    healthy = [alias for alias in replica_aliases() if replica_health.is_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+@contextmanager
+def primary_reads():
+    """Send the reads inside the block to the primary."""
+    token = force_primary.set(True)
+    try:
+        yield
+    finally:
+        force_primary.reset(token)
+
+
+class RoutingState:
+    """Where one request reads from; a write moves the rest of it to the primary."""
+
+    def __init__(self, use_replica):
+        self.replica = choose_replica() if use_replica else None
+        self.wrote   = False
+
+    def read_alias(self):
+        return self.replica or DEFAULT_DB_ALIAS
+
+    def record_write(self):
+        self.wrote   = True
+        self.replica = None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # Related objects come from wherever their instance was loaded.
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        state = current_routing.get()
+        if state is None or force_primary.get() or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.read_alias()
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            state.record_write()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        return False if db in replica_aliases() else None
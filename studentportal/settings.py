@@ -2,8 +2,10 @@
 Django settings for studentportal project.
 """
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -30,21 +32,36 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'student',
     'principal',
+    'mailqueue',
+]
+
+# Only needed for their management commands and template tags, never on the
+# request path - media storage imports cloudinary_storage lazily. Set
+# DEFER_OPTIONAL_APPS on serverless deploys to keep them out of cold starts
+# (see `manage.py startup_profile`).
+OPTIONAL_APPS = [
     'cloudinary',         # ← Cloudinary
     'cloudinary_storage', # ← Cloudinary storage
 ]
+DEFER_OPTIONAL_APPS = config('DEFER_OPTIONAL_APPS', default=False, cast=bool)
+if not DEFER_OPTIONAL_APPS:
+    INSTALLED_APPS += OPTIONAL_APPS
 
 
 # ==============================================================================
 # MIDDLEWARE
 # ==============================================================================
 MIDDLEWARE = [
+    'middleware.ProfilingMiddleware',
+    'middleware.QueryBudgetMiddleware',
+    'middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'middleware.ProfilingAuthMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'middleware.RoleBasedAccessMiddleware',
@@ -54,25 +71,52 @@ ROOT_URLCONF = 'studentportal.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': ['template'],
-        'APP_DIRS': True,
+        'BACKEND': 'studentportal.profiling.ProfiledDjangoTemplates',
+        'DIRS': [BASE_DIR / 'template'],
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compiled templates stay in memory for the life of the process.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
+# Compile every template under DIRS when wsgi.py is imported. Off by default:
+# on Vercel every cold start imports wsgi.py, so this moves the parsing in
+# front of the first request rather than removing it. build_files.sh runs
+# warm_templates instead, which catches syntax errors at build time.
+TEMPLATE_WARMUP = config('TEMPLATE_WARMUP', default=False, cast=bool)
+
 WSGI_APPLICATION = 'studentportal.wsgi.application'
 
 
 # ==============================================================================
 # DATABASE — Neon PostgreSQL
 # ==============================================================================
+# DB_CONNECTION_MODE picks how connections are reused:
+#   persistent - keep one connection per worker for DB_CONN_MAX_AGE seconds,
+#                health-checked before reuse (default).
+#   pool       - psycopg 3 connection pool inside the process (needs
+#                `psycopg[pool]`, in requirements.txt; Django requires
+#                CONN_MAX_AGE = 0 here).
+#   pgbouncer  - talk to PgBouncer / Neon's pooled endpoint in transaction
+#                mode: no server-side cursors, short-lived client connections.
+DB_CONNECTION_MODE = config('DB_CONNECTION_MODE', default='persistent')
+if DB_CONNECTION_MODE not in ('persistent', 'pool', 'pgbouncer'):
+    raise ImproperlyConfigured(f'Unknown DB_CONNECTION_MODE {DB_CONNECTION_MODE!r}; use persistent, pool or pgbouncer.')
+if DB_CONNECTION_MODE == 'pool' and find_spec('psycopg_pool') is None:
+    # Django's OPTIONS['pool'] only works with psycopg 3, not psycopg2.
+    raise ImproperlyConfigured("DB_CONNECTION_MODE=pool needs psycopg 3 with its pool: pip install 'psycopg[binary,pool]'.")
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -81,18 +125,115 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=300, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
         'OPTIONS': {
             'sslmode': 'require',
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
         },
     }
 }
 
+if DB_CONNECTION_MODE == 'pool':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DB_POOL_MIN_SIZE', default=1, cast=int),
+        'max_size': config('DB_POOL_MAX_SIZE', default=4, cast=int),
+        'timeout':  config('DB_POOL_TIMEOUT', default=10, cast=int),
+    }
+elif DB_CONNECTION_MODE == 'pgbouncer':
+    DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=0, cast=int)
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Read replicas (e.g. Neon read replica endpoints) as comma-separated hosts.
+# Each becomes a 'replica<n>' alias with the primary's credentials, and
+# studentportal.routers sends the reads of GET requests to them. Try it
+# locally with studentportal.settings_replicas (two SQLite files).
+DATABASE_REPLICAS = []
+for number, host in enumerate(filter(None, config('DB_REPLICA_HOSTS', default='').split(',')), 1):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'HOST':    host.strip(),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST':    {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['studentportal.routers.ReplicaRouter']
+
+# After a request writes, the client reads from the primary for this long
+# (read-your-writes while the replicas catch up).
+REPLICA_STICKY_SECONDS  = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+# Healthy replicas are re-probed every REPLICA_HEALTH_INTERVAL seconds; one
+# that is unreachable or more than REPLICA_MAX_LAG_SECONDS behind (Postgres
+# only, 0 = no limit) is skipped for REPLICA_RETRY_SECONDS.
+REPLICA_HEALTH_INTERVAL = config('REPLICA_HEALTH_INTERVAL', default=10, cast=int)
+REPLICA_RETRY_SECONDS   = config('REPLICA_RETRY_SECONDS', default=30, cast=int)
+REPLICA_MAX_LAG_SECONDS = config('REPLICA_MAX_LAG_SECONDS', default=30, cast=int)
+
+
+# Per-request query budget: requests over either limit are logged by
+# middleware.QueryBudgetMiddleware on the "studentportal.querybudget" logger.
+QUERY_BUDGET_ENABLED     = config('QUERY_BUDGET_ENABLED', default=DEBUG, cast=bool)
+QUERY_BUDGET_MAX_QUERIES = config('QUERY_BUDGET_MAX_QUERIES', default=15, cast=int)
+QUERY_BUDGET_MAX_DB_MS   = config('QUERY_BUDGET_MAX_DB_MS', default=250, cast=int)
+
+
+# ==============================================================================
+# CACHES
+# ==============================================================================
+# 'locmem' keeps each worker's cache in its own memory; 'file' shares one
+# directory between workers so invalidations are seen by all of them.
+def cache_backend(kind, location):
+    if kind == 'file':
+        return {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location,
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': location,
+    }
+
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+
+CACHES = {
+    'default': cache_backend(
+        CACHE_BACKEND,
+        config('CACHE_LOCATION', default='/tmp/studentportal-cache'),
+    ),
+    'fragments': cache_backend(
+        config('FRAGMENT_CACHE_BACKEND', default='locmem'),
+        config('FRAGMENT_CACHE_LOCATION', default='/tmp/studentportal-fragments'),
+    ),
+}
+
+FRAGMENT_CACHE_ALIAS   = 'fragments'
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=3600, cast=int)
+
 
 # ==============================================================================
 # AUTH
 # ==============================================================================
 AUTH_USER_MODEL = 'student.Student'
 
+# Serves request.user from a cached snapshot instead of a SELECT per request.
+AUTHENTICATION_BACKENDS = ['student.backends.CachedModelBackend']
+
+# A password change or deactivation only reaches the cache of the worker
+# that handled it, and a stale snapshot would keep old sessions valid. So
+# snapshots (and cached sessions) are only used with a shared cache; on
+# per-worker locmem the backend loads the user from the database.
+USER_CACHE_ALIAS      = 'default'
+USER_SNAPSHOT_TIMEOUT = config('USER_SNAPSHOT_TIMEOUT', default=0 if CACHE_BACKEND == 'locmem' else 3600, cast=int)
+
+SESSION_ENGINE = config(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.db' if CACHE_BACKEND == 'locmem' else 'django.contrib.sessions.backends.cached_db',
+)
+SESSION_CACHE_ALIAS = 'default'
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -123,6 +264,16 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Built into static/ by `manage.py build_css` (see tailwind.config.js);
+# collectstatic then gives it a hashed name that WhiteNoise serves with a
+# far-future Cache-Control. TAILWIND_CLI overrides the CLI it runs.
+TAILWIND_CSS = 'css/tailwind.css'
+TAILWIND_CLI = config('TAILWIND_CLI', default='')
+# Load the Tailwind play CDN when the stylesheet hasn't been built (fresh
+# checkouts, local dev). Off unless DEBUG: collectstatic then fails without
+# the compiled file (principal.checks) rather than shipping the CDN.
+TAILWIND_CDN_FALLBACK = config('TAILWIND_CDN_FALLBACK', default=DEBUG, cast=bool)
+
 
 # ==============================================================================
 # MEDIA FILES — Cloudinary
@@ -135,6 +286,11 @@ CLOUDINARY_STORAGE = {
 
 MEDIA_URL = '/media/'
 
+# Derivatives of uploaded student pictures (student.images). WEBP falls back
+# to JPEG when Pillow is built without WebP support.
+STUDENT_PIC_FORMAT  = config('STUDENT_PIC_FORMAT', default='WEBP')
+STUDENT_PIC_QUALITY = config('STUDENT_PIC_QUALITY', default=80, cast=int)
+
 # Django 4.2+ STORAGES — media goes to Cloudinary, static served by Whitenoise
 STORAGES = {
     'default': {
@@ -149,7 +305,10 @@ STORAGES = {
 # ==============================================================================
 # EMAIL — Gmail SMTP
 # ==============================================================================
-EMAIL_BACKEND       = 'django.core.mail.backends.smtp.EmailBackend'
+# Set EMAIL_BACKEND to django.core.mail.backends.filebased.EmailBackend (with
+# EMAIL_FILE_PATH) or .console.EmailBackend to exercise the queue locally.
+EMAIL_BACKEND       = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH     = config('EMAIL_FILE_PATH', default=str(BASE_DIR / 'sent_mail'))
 EMAIL_HOST          = 'smtp.gmail.com'
 EMAIL_PORT          = 587
 EMAIL_USE_TLS       = True
@@ -157,6 +316,13 @@ EMAIL_HOST_USER     = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL  = config('EMAIL_HOST_USER')
 
+# Outbound mail is queued in the database and sent by `manage.py send_queued_mail`.
+MAIL_QUEUE_BATCH_SIZE         = config('MAIL_QUEUE_BATCH_SIZE', default=50, cast=int)
+MAIL_QUEUE_MAX_ATTEMPTS       = config('MAIL_QUEUE_MAX_ATTEMPTS', default=5, cast=int)
+MAIL_QUEUE_RETRY_BASE_SECONDS = config('MAIL_QUEUE_RETRY_BASE_SECONDS', default=60, cast=int)
+# A claimed message still SENDING after this long (its worker died) is retried.
+MAIL_QUEUE_CLAIM_TIMEOUT      = config('MAIL_QUEUE_CLAIM_TIMEOUT', default=600, cast=int)
+
 
 # ==============================================================================
 # MESSAGES
@@ -168,4 +334,57 @@ MESSAGE_TAGS = {
     messages.SUCCESS: 'success',
     messages.WARNING: 'warning',
     messages.ERROR:   'error',
-}
\ No newline at end of file
+}
+
+# ==============================================================================
+# DASHBOARD
+# ==============================================================================
+DASHBOARD_PENDING_LIMIT   = config('DASHBOARD_PENDING_LIMIT', default=10, cast=int)
+
+# The dashboard and per-student summaries are invalidated on write, but with
+# per-worker locmem only in the worker that handled the write; keep them
+# short-lived there so the other workers catch up within seconds.
+DASHBOARD_SUMMARY_TIMEOUT = config('DASHBOARD_SUMMARY_TIMEOUT', default=30 if CACHE_BACKEND == 'locmem' else 300, cast=int)
+STUDENT_SUMMARY_TIMEOUT   = config('STUDENT_SUMMARY_TIMEOUT', default=30 if CACHE_BACKEND == 'locmem' else 600, cast=int)
+
+
+# ==============================================================================
+# ANALYTICS
+# ==============================================================================
+# Rollups are refreshed by `manage.py refresh_analytics` (run it from cron).
+ANALYTICS_REFRESH_LAG_SECONDS = config('ANALYTICS_REFRESH_LAG_SECONDS', default=5, cast=int)
+ANALYTICS_DEFAULT_DAYS        = config('ANALYTICS_DEFAULT_DAYS', default=365, cast=int)
+
+
+# ==============================================================================
+# LIST PAGINATION
+# ==============================================================================
+LIST_PAGE_SIZE          = config('LIST_PAGE_SIZE', default=50, cast=int)
+LIST_MAX_PAGE_SIZE      = config('LIST_MAX_PAGE_SIZE', default=200, cast=int)
+LIST_COUNT_ESTIMATE_CAP = config('LIST_COUNT_ESTIMATE_CAP', default=1000, cast=int)
+
+# Rows fetched per round trip by the streaming CSV/XLSX exports.
+EXPORT_CHUNK_SIZE       = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+
+# ==============================================================================
+# CATALOGUE API
+# ==============================================================================
+# Cache-Control on /api/catalogue/: max-age for browsers, s-maxage for a CDN
+# in front of the app. Both revalidate with the ETag once expired.
+CATALOGUE_MAX_AGE            = config('CATALOGUE_MAX_AGE', default=60, cast=int)
+CATALOGUE_SHARED_MAX_AGE     = config('CATALOGUE_SHARED_MAX_AGE', default=300, cast=int)
+CATALOGUE_PAGE_CACHE_TIMEOUT = config('CATALOGUE_PAGE_CACHE_TIMEOUT', default=3600, cast=int)
+
+
+# ==============================================================================
+# PROFILING
+# ==============================================================================
+# Sampled per-request profiling (Server-Timing header + rolling histograms
+# flushed to PROFILING_DIR). Read them with `manage.py profiling_report`.
+PROFILING_ENABLED        = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_SAMPLE_RATE    = config('PROFILING_SAMPLE_RATE', default=0.05, cast=float)
+PROFILING_DIR            = config('PROFILING_DIR', default='/tmp/studentportal-profiles')
+PROFILING_FLUSH_SECONDS  = config('PROFILING_FLUSH_SECONDS', default=30, cast=int)
+PROFILING_WINDOW_SECONDS = config('PROFILING_WINDOW_SECONDS', default=300, cast=int)
+PROFILING_WINDOWS        = config('PROFILING_WINDOWS', default=12, cast=int)
@@ -0,0 +1,31 @@
+"""
+Settings for serving the project over ASGI:
+
+    pip install "uvicorn[standard]"
+    DJANGO_SETTINGS_MODULE=studentportal.settings_asgi \
+        uvicorn studentportal.asgi:application --workers 2 --host 0.0.0.0 --port 8000
+
+(or gunicorn with ``-k uvicorn.workers.UvicornWorker``). The WSGI entry
+point and studentportal.settings stay the default for the Vercel build.
+
+What differs from the WSGI profile:
+
+* Persistent connections are off. Django opens connections per thread,
+  and under ASGI sync code runs on executor threads, so CONN_MAX_AGE would
+  leave idle connections behind on each of them. Connections go through
+  Neon's pooled endpoint instead (DB_CONNECTION_MODE=pgbouncer, DB_HOST set
+  to the ``-pooler`` host), or through the psycopg pool with
+  DB_CONNECTION_MODE=pool.
+* The views and middleware are synchronous; Django runs them on the
+  thread-sensitive thread.
+"""
+import os
+
+os.environ.setdefault('DB_CONNECTION_MODE', 'pgbouncer')
+
+from .settings import *  # noqa: E402,F401,F403
+
+
+if DB_CONNECTION_MODE == 'persistent':  # noqa: F405
+    for database in DATABASES.values():  # noqa: F405
+        database['CONN_MAX_AGE'] = 0
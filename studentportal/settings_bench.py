@@ -0,0 +1,40 @@
+"""
+Settings for `manage.py benchmark_views`.
+
+Runs the project against a throwaway in-memory SQLite database with local
+storage and mail, so benchmarks never touch Neon, Cloudinary or Gmail:
+
+    python manage.py benchmark_views --settings=studentportal.settings_bench
+"""
+import os
+
+for name in ('DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST',
+             'CLOUD_NAME', 'API_KEY', 'API_SECRET',
+             'EMAIL_HOST_USER', 'EMAIL_HOST_PASSWORD'):
+    os.environ.setdefault(name, 'benchmark')
+
+from .settings import *  # noqa: E402,F401,F403
+
+
+BENCHMARK_MODE = True
+
+# A shared-cache in-memory database, so every connection sees the same data.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:benchmark?mode=memory&cache=shared',
+    }
+}
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+QUERY_BUDGET_ENABLED = False
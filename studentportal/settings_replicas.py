@@ -0,0 +1,53 @@
+"""
+Local read-replica setup: two SQLite files stand in for the Neon primary
+and a read replica, so studentportal.routers can be tried without either:
+
+    python manage.py migrate --settings=studentportal.settings_replicas
+    python manage.py replica_status --sync --settings=studentportal.settings_replicas
+    python manage.py runserver --settings=studentportal.settings_replicas
+
+Nothing replicates on its own. `replica_status --sync` copies the primary
+file over the replica, so between syncs the replica lags the way a real
+one does. Pages viewed within REPLICA_STICKY_SECONDS of a write still show
+it, later ones show the replica's stale copy until the next sync. The
+replica is opened read-only: a write routed to it fails loudly. Delete its
+file to see reads fall back to the primary.
+"""
+import os
+
+for name in ('DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST',
+             'CLOUD_NAME', 'API_KEY', 'API_SECRET',
+             'EMAIL_HOST_USER', 'EMAIL_HOST_PASSWORD'):
+    os.environ.setdefault(name, 'local')
+
+from .settings import *  # noqa: E402,F401,F403
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'local_primary.sqlite3',  # noqa: F405
+    },
+    'replica1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{BASE_DIR / "local_replica.sqlite3"}?mode=ro',  # noqa: F405
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+DATABASE_REPLICAS = ['replica1']
+
+# Short enough to watch the replica serve stale pages after a write.
+REPLICA_HEALTH_INTERVAL = 2
+REPLICA_RETRY_SECONDS   = 5
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+MEDIA_ROOT = BASE_DIR / 'media'  # noqa: F405
+
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -0,0 +1,48 @@
+"""
+Template warm-up.
+
+Django keeps compiled templates in memory only (the cached loader), so they
+can't be shipped precompiled. Instead ``manage.py warm_templates`` compiles
+every template under the project ``DIRS`` at build time - a syntax error
+fails the build. With TEMPLATE_WARMUP on (off by default), wsgi.py also
+does it at import so the cached loader is full before the first request;
+that suits long-lived workers, not serverless cold starts.
+"""
+import time
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+
+
+def project_template_names(engine):
+    for directory in engine.dirs:
+        root = Path(directory)
+        for path in sorted(root.rglob('*')):
+            if path.is_file() and path.suffix in TEMPLATE_SUFFIXES:
+                yield path.relative_to(root).as_posix()
+
+
+def warm_templates():
+    """
+    Compile every project template into the cached loader of each Django
+    template engine. Returns ``(compiled, errors, seconds)``; ``errors`` maps
+    name -> message.
+    """
+    compiled = []
+    errors = {}
+    start = time.perf_counter()
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in project_template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+            except TemplateSyntaxError as exc:
+                errors[name] = str(exc)
+            else:
+                compiled.append(name)
+    return compiled, errors, time.perf_counter() - start
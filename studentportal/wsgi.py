@@ -9,9 +9,14 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studentportal.settings')
 
 app = get_wsgi_application()       
 application = app   
+
+if settings.TEMPLATE_WARMUP:
+    from studentportal.templating import warm_templates
+    warm_templates()
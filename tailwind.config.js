@@ -0,0 +1,15 @@
+// Used by `python manage.py build_css`. Only classes found in these files
+// end up in static/css/tailwind.css, so markup built in Python (form widget
+// attrs, messages) has to be scanned too.
+module.exports = {
+  content: [
+    './template/**/*.html',
+    './student/*.py',
+    './principal/*.py',
+    './principal/templatetags/*.py',
+  ],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};